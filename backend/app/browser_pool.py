@@ -0,0 +1,85 @@
+"""
+Shared headless Chromium for scans.
+Launches the browser once and hands out a fresh context per scan.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Sequence
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """
+    Keeps one Chromium process running between scans instead of paying a
+    cold browser launch on every request.
+
+    Each `acquire()` gets its own BrowserContext, so cookies, storage and
+    cache never leak between scans. The browser is launched lazily (or up
+    front via `start()`) and relaunched on the next acquire if it crashed.
+    """
+
+    def __init__(self, launch_args: Sequence[str] = ()):
+        self.launch_args = list(launch_args)
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------ #
+    #  Public API
+    # ------------------------------------------------------------------ #
+
+    async def start(self):
+        """Launch the browser now rather than on the first scan."""
+        await self._get_browser()
+
+    async def close(self):
+        """Close the browser and stop the Playwright driver."""
+        async with self._lock:
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception as e:
+                    logger.warning(f"Closing shared browser failed: {e}")
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[BrowserContext]:
+        """Yield a fresh browser context, closed again on exit."""
+        browser = await self._get_browser()
+        context = await browser.new_context()
+        try:
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.warning(f"Closing browser context failed: {e}")
+
+    # ------------------------------------------------------------------ #
+    #  Helpers
+    # ------------------------------------------------------------------ #
+
+    async def _get_browser(self) -> Browser:
+        browser = self._browser
+        if browser is not None and browser.is_connected():
+            return browser
+
+        async with self._lock:
+            # Another scan may have relaunched it while we waited
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                logger.info("Launching shared Chromium")
+                self._browser = await self._playwright.chromium.launch(
+                    headless=True, args=self.launch_args
+                )
+            return self._browser
@@ -5,20 +5,48 @@ Main FastAPI application
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response
-from pydantic import BaseModel, HttpUrl, EmailStr
-from typing import Optional, Literal
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.background import BackgroundTask
+from starlette.routing import Route
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, HttpUrl, field_validator
+from typing import Annotated, Optional, Literal, Union
+import asyncio
+import atexit
+import hashlib
+import html
 import logging
+import multiprocessing
 import os
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.application import MIMEApplication
-
-from .payment import PaymentService
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+import queue
+import re
+import string
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import urlsplit
+import msgspec
+import orjson
+from cachetools import TTLCache
+from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
+
+from .payment import FINALIZE_RUNNING, PaymentService
+from .pdf_generator import generate_pdf_report, init_pdf_worker
+from .scanner import browser_pool, scan_url
+from .smtp_pool import SMTPPool
+
+# Configure logging – handlers enqueue records; a background thread does the stderr I/O
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+_log_listener = QueueListener(_log_queue, _stream_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+# Not basicConfig(handlers=...): it would format on the QueueHandler and again in the listener
+logging.getLogger().addHandler(QueueHandler(_log_queue))
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -27,7 +55,8 @@ app = FastAPI(
     description="Hebrew-first WCAG 2.2 AA & Israeli Standard 5568 compliance checker",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware – allow Vercel frontend + local dev
@@ -37,13 +66,29 @@ _default_origins = ",".join([
     "http://localhost:8888",
     "https://gilkalman-portfolio-accessibility-s.vercel.app",
 ])
-_allowed_origins = [
+_allowed_origins = frozenset(
     o.strip() for o in os.getenv("ALLOWED_ORIGINS", _default_origins).split(",") if o.strip()
-]
-_allow_origin_regex = r"https://.*\.vercel\.app"
+)
+_allow_origin_regex = re.compile(r"https://.*\.vercel\.app", re.ASCII)
+
+
+class _FastCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that tries the O(1) set lookup before the regex."""
+
+    def __init__(self, app, allow_origin_regex: Optional[re.Pattern] = None, **kwargs):
+        super().__init__(app, **kwargs)
+        self.allow_origin_regex = allow_origin_regex
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        if self.allow_all_origins or origin in self.allow_origins:
+            return True
+        return self.allow_origin_regex is not None and bool(
+            self.allow_origin_regex.fullmatch(origin)
+        )
+
 
 app.add_middleware(
-    CORSMiddleware,
+    _FastCORSMiddleware,
     allow_origins=_allowed_origins,
     allow_origin_regex=_allow_origin_regex,
     allow_credentials=True,
@@ -51,49 +96,73 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],
 )
 
+# Scan results are long, repetitive JSON (Hebrew text + HTML snippets); gzip shrinks them 5-10x
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Request/Response models
-class ScanRequest(BaseModel):
-    url: HttpUrl
+# Hot-path request bodies are decoded with msgspec instead of Pydantic: URL and
+# email are validated by the decoder itself using precompiled patterns.
+_URL_PATTERN = r"^https?://[^\s/?#]+(?:[/?#]\S*)?$"
+_EMAIL_PATTERN = r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"
+
+UrlField = Annotated[str, msgspec.Meta(pattern=_URL_PATTERN, max_length=2083)]
+EmailField = Annotated[str, msgspec.Meta(pattern=_EMAIL_PATTERN, max_length=254)]
+_EMAIL_RE = re.compile(_EMAIL_PATTERN)
+
+
+class ScanRequest(msgspec.Struct):
+    url: UrlField
     standard: Literal["WCAG_2_2_AA", "IL_5568"] = "IL_5568"
     locale: Literal["he", "en"] = "he"
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "url": "https://example.com",
-                "standard": "IL_5568",
-                "locale": "he"
-            }
-        }
 
 
-class SendReportRequest(BaseModel):
-    url: HttpUrl
+class SendReportRequest(msgspec.Struct):
+    url: UrlField
+    email: EmailField
     scan_id: str = ""
-    email: EmailStr
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "url": "https://example.com",
-                "scan_id": "scan_abc123",
-                "email": "user@example.com"
-            }
+
+_scan_request_decoder = msgspec.json.Decoder(ScanRequest)
+_send_report_decoder = msgspec.json.Decoder(SendReportRequest)
+
+
+def _openapi_body(struct_type: type, example: dict) -> dict:
+    """Describe a msgspec request body for /docs (FastAPI can't introspect it)."""
+    _, components = msgspec.json.schema_components([struct_type])
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": components[struct_type.__name__],
+                    "example": example,
+                }
+            },
         }
+    }
 
 
-class HealthResponse(BaseModel):
-    status: str
-    version: str
-    coverage: dict
+async def _decode_body(request: Request, decoder: msgspec.json.Decoder):
+    """Decode and validate a JSON request body, mapping errors to 422."""
+    try:
+        return decoder.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 class CreatePaymentRequest(BaseModel):
     url: HttpUrl
-    email: EmailStr
+    email: str
     scan_id: str = ""
 
+    @field_validator("email")
+    @classmethod
+    def _check_email(cls, v: str) -> str:
+        if len(v) > 254 or not _EMAIL_RE.match(v):
+            raise ValueError("Invalid email address")
+        return v
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -121,35 +190,326 @@ class PaymentVerifyResponse(BaseModel):
 # Payment service singleton
 payment_service = PaymentService()
 
+# Static health payloads, serialized once at import
+_ROOT_JSON = orjson.dumps({
+    "status": "ok",
+    "version": "1.0.0",
+    "coverage": {
+        "axe_core": "57%",
+        "playwright_checks": "20%",
+        "total_automated": "77%",
+        "manual_required": "23%"
+    }
+})
+_HEALTH_JSON = orjson.dumps({"status": "healthy"})
+
+# PDF rendering is CPU-bound; run it in worker processes so it neither
+# blocks the event loop nor serializes on the GIL. Every web worker has its
+# own pool, so by default the cores are split between them rather than each
+# web worker starting cpu_count renderers.
+_WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+_PDF_WORKERS = int(os.getenv("PDF_WORKERS", max(1, (os.cpu_count() or 1) // _WEB_WORKERS)))
+
+
+# Workers come from a forkserver, not a plain fork of this process: the pool
+# is rebuilt after the browser pool is running, and a forked worker would
+# inherit the Playwright driver's pipes (and the logging listener's queue)
+_PDF_MP_CONTEXT = multiprocessing.get_context("forkserver")
+# The server preloads only the renderer, not __main__ (uvicorn or this app)
+_PDF_MP_CONTEXT.set_forkserver_preload(["app.pdf_generator"])
+
+# Created by the startup hook (starting workers at import would hand them to
+# every importer) and replaced if a worker dies and breaks it; see _run_in_pdf_pool
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _new_pdf_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=_PDF_WORKERS, mp_context=_PDF_MP_CONTEXT, initializer=init_pdf_worker
+    )
+
+
+async def _run_in_pdf_pool(fn, *args):
+    """
+    Run fn in the PDF pool. An OOM-killed or crashed WeasyPrint worker
+    breaks the whole executor, so rebuild it once and retry instead of
+    failing every later render until the process restarts.
+    """
+    global _PDF_POOL
+    if _PDF_POOL is None:
+        _PDF_POOL = _new_pdf_pool()
+    pool = _PDF_POOL
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # Concurrent failures share one rebuild: only replace the pool we used
+        if _PDF_POOL is pool:
+            logger.error("PDF worker died, restarting the PDF process pool")
+            pool.shutdown(wait=False, cancel_futures=True)
+            _PDF_POOL = _new_pdf_pool()
+        return await loop.run_in_executor(_PDF_POOL, fn, *args)
+
+
+# Rendered reports keyed by their scan (see _pdf_cache_key), so exporting the
+# same scan twice (download + email, repeated downloads) renders once
+_PDF_CACHE: TTLCache = TTLCache(maxsize=32, ttl=int(os.getenv("SCAN_CACHE_TTL", "300")))
+
+
+def _pdf_cache_key(results: dict) -> Union[tuple, bytes]:
+    # Every scan gets a fresh random scan_id, so (scan_id, timestamp) already
+    # identifies the results; only hash the full dump when those are missing
+    scan_id = results.get("scan_id")
+    timestamp = results.get("timestamp")
+    if scan_id and timestamp:
+        return (scan_id, timestamp)
+    return hashlib.blake2b(
+        orjson.dumps(results, option=orjson.OPT_SORT_KEYS, default=str),
+        digest_size=16,
+    ).digest()
+
+
+async def _render_pdf(results: dict) -> bytes:
+    """Generate the PDF report for scan results in the process pool."""
+    key = _pdf_cache_key(results)
+    pdf_bytes = _PDF_CACHE.get(key)
+    if pdf_bytes is None:
+        pdf_bytes = await _run_in_pdf_pool(generate_pdf_report, results)
+        _PDF_CACHE[key] = pdf_bytes
+    return pdf_bytes
+
+
+async def _render_pdf_file(results: dict) -> str:
+    """Render the PDF report to a temp file in the process pool; returns its path."""
+    fd, path = tempfile.mkstemp(prefix="report-", suffix=".pdf")
+    os.close(fd)
+    try:
+        await _run_in_pdf_pool(generate_pdf_report, results, path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _pdf_file_response(path: str, safe_id: str) -> FileResponse:
+    """Stream a rendered PDF from disk in chunks and delete it afterwards."""
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"accessibility-report-{safe_id}.pdf",
+        background=BackgroundTask(os.unlink, path),
+    )
+
+
+_PDF_CHUNK_SIZE = 64 * 1024
+
+# Bytes to strip from scan_id before it goes into a filename header
+_SAFE_ID_CHARS = (string.ascii_letters + string.digits + "-_").encode("ascii")
+_SAFE_ID_DELETE = bytes(b for b in range(256) if b not in _SAFE_ID_CHARS)
+
+
+def _safe_id(scan_id: Optional[str]) -> str:
+    """Keep only [A-Za-z0-9_-] in a single C-level translate pass."""
+    safe = (scan_id or "").encode("ascii", "ignore").translate(None, _SAFE_ID_DELETE)
+    return safe.decode("ascii") or "report"
+
+
+def _iter_pdf_chunks(pdf_bytes: bytes):
+    """Yield zero-copy 64KB slices so uvicorn can interleave socket writes."""
+    view = memoryview(pdf_bytes)
+    for start in range(0, len(view), _PDF_CHUNK_SIZE):
+        yield view[start:start + _PDF_CHUNK_SIZE]
+
+
+def _pdf_response(
+    pdf_bytes: bytes, safe_id: str, background: Optional[BackgroundTask] = None
+) -> StreamingResponse:
+    return StreamingResponse(
+        _iter_pdf_chunks(pdf_bytes),
+        media_type="application/pdf",
+        background=background,
+        headers={
+            "Content-Disposition": f'attachment; filename="accessibility-report-{safe_id}.pdf"',
+            "Content-Length": str(len(pdf_bytes)),
+        },
+    )
+
+
+# Recent scan results keyed by (url, standard, locale), plus scans still
+# running so concurrent requests for the same target share one browser run.
+_SCAN_CACHE: TTLCache = TTLCache(
+    maxsize=int(os.getenv("SCAN_CACHE_SIZE", "512")),
+    ttl=int(os.getenv("SCAN_CACHE_TTL", "300")),
+)
+_inflight_scans: dict[tuple, asyncio.Future] = {}
+
+# Each scan drives its own Chromium context and renderer; cap how many run at once
+_SCAN_SEMAPHORE = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_SCANS", "4")))
+
+
+async def _limited_scan(url: str, standard: str = "IL_5568", locale: str = "he") -> dict:
+    async with _SCAN_SEMAPHORE:
+        return await scan_url(url=url, standard=standard, locale=locale)
+
+
+def _scan_key(url: str, standard: str, locale: str) -> tuple:
+    """
+    Cache/coalescing key for a scan. Normalizes the parts of the URL that
+    don't change the page (scheme/host case, empty path, fragment), so e.g.
+    the free scan of "https://Example.com" and the paid re-scan of
+    "https://example.com/" (pydantic's HttpUrl form) share one entry.
+    """
+    parts = urlsplit(url)
+    return (
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        parts.query,
+        standard,
+        locale,
+    )
+
+
+async def _cached_scan(url: str, standard: str = "IL_5568", locale: str = "he") -> dict:
+    """Scan a URL, reusing a recent or in-flight scan of the same target."""
+    key = _scan_key(url, standard, locale)
+    cached = _SCAN_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    task = _inflight_scans.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_limited_scan(url, standard, locale))
+        _inflight_scans[key] = task
+
+        def _on_done(t: asyncio.Future):
+            _inflight_scans.pop(key, None)
+            if not t.cancelled() and t.exception() is None:
+                _SCAN_CACHE[key] = t.result()
+
+        task.add_done_callback(_on_done)
+
+    # Shield so one client disconnecting doesn't cancel the scan for the others
+    return await asyncio.shield(task)
+
+
+@app.on_event("startup")
+def _start_pdf_pool():
+    global _PDF_POOL
+    _PDF_POOL = _new_pdf_pool()
+    # The executor only spawns workers as work arrives; queue one no-op per
+    # worker so the whole pool starts (and warms up) in the background now
+    for _ in range(_PDF_WORKERS):
+        _PDF_POOL.submit(int)
+
+
+@app.on_event("shutdown")
+def _shutdown_pdf_pool():
+    if _PDF_POOL is not None:
+        _PDF_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+@app.on_event("startup")
+async def _start_browser_pool():
+    # Launch Chromium now so the first scan doesn't pay the cold start. PDF
+    # workers never inherit the driver's pipes (see _PDF_MP_CONTEXT), so this
+    # may run before or after _start_pdf_pool.
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        logger.error(f"Browser launch failed, will retry on first scan: {e}")
+
+
+@app.on_event("shutdown")
+async def _shutdown_browser_pool():
+    await browser_pool.close()
+
+
+# Authenticated SMTP connections, reused across report emails
+_smtp_pool: Optional[SMTPPool] = None
+
+
+def _get_smtp_pool() -> SMTPPool:
+    global _smtp_pool
+    if _smtp_pool is None:
+        smtp_host = os.getenv("SMTP_HOST", "")
+        smtp_user = os.getenv("SMTP_USER", "")
+        smtp_pass = os.getenv("SMTP_PASS", "")
+        if not smtp_host or not smtp_user or not smtp_pass:
+            raise RuntimeError(
+                "SMTP not configured. Set SMTP_HOST, SMTP_USER, SMTP_PASS env vars."
+            )
+        _smtp_pool = SMTPPool(
+            host=smtp_host,
+            port=int(os.getenv("SMTP_PORT", "587")),
+            user=smtp_user,
+            password=smtp_pass,
+            size=int(os.getenv("SMTP_POOL_SIZE", "4")),
+        )
+        _smtp_pool.start()
+    return _smtp_pool
+
+
+@app.on_event("startup")
+async def _start_smtp_pool():
+    try:
+        pool = _get_smtp_pool()
+    except RuntimeError:
+        logger.info("SMTP not configured — email pool disabled")
+        return
+    await pool.fill()
+
+
+@app.on_event("shutdown")
+async def _shutdown_payment_client():
+    await payment_service.aclose()
+
+
+@app.on_event("shutdown")
+async def _shutdown_smtp_pool():
+    if _smtp_pool is not None:
+        await _smtp_pool.close()
+
 
 # Routes
-@app.get("/", response_model=HealthResponse)
+@app.get("/")
 async def root():
     """
     API health check
     """
-    return {
-        "status": "ok",
-        "version": "1.0.0",
-        "coverage": {
-            "axe_core": "57%",
-            "playwright_checks": "20%",
-            "total_automated": "77%",
-            "manual_required": "23%"
-        }
-    }
+    return Response(_ROOT_JSON, media_type="application/json")
 
 
-@app.get("/health")
-async def health():
+class _HealthEndpoint:
     """
-    Health check endpoint for monitoring
+    Health check endpoint for monitoring.
+    Raw ASGI app: skips FastAPI's request parsing and response pipeline.
     """
-    return {"status": "healthy"}
 
+    _HEADERS = (
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_HEALTH_JSON)).encode("ascii")),
+    )
+
+    async def __call__(self, scope, receive, send):
+        # Fresh headers list per response: middleware appends to it in place
+        await send({"type": "http.response.start", "status": 200, "headers": list(self._HEADERS)})
+        body = b"" if scope["method"] == "HEAD" else _HEALTH_JSON
+        await send({"type": "http.response.body", "body": body})
+
+
+app.router.routes.append(Route("/health", endpoint=_HealthEndpoint(), methods=["GET", "HEAD"]))
 
-@app.post("/api/v1/scan")
-async def scan_page(request: ScanRequest):
+
+@app.post(
+    "/api/v1/scan",
+    openapi_extra=_openapi_body(ScanRequest, {
+        "url": "https://example.com",
+        "standard": "IL_5568",
+        "locale": "he"
+    }),
+)
+async def scan_page(http_request: Request):
     """
     Scan a single URL for accessibility issues
     
@@ -159,15 +519,13 @@ async def scan_page(request: ScanRequest):
     - Detailed issues with fix instructions
     - Legal risk assessment (Israeli law)
     """
+    request = await _decode_body(http_request, _scan_request_decoder)
     try:
         logger.info(f"Scanning URL: {request.url}")
         
-        # Import scanner (will create next)
-        from .scanner import scan_url
-        
         # Perform scan
-        results = await scan_url(
-            url=str(request.url),
+        results = await _cached_scan(
+            url=request.url,
             standard=request.standard,
             locale=request.locale
         )
@@ -179,73 +537,82 @@ async def scan_page(request: ScanRequest):
         raise HTTPException(status_code=500, detail="Scan failed. Please check the URL and try again.")
 
 
-@app.post("/api/v1/scan/pdf")
-async def scan_and_generate_pdf(request: ScanRequest):
+@app.post(
+    "/api/v1/scan/pdf",
+    openapi_extra=_openapi_body(ScanRequest, {
+        "url": "https://example.com",
+        "standard": "IL_5568",
+        "locale": "he"
+    }),
+)
+async def scan_and_generate_pdf(http_request: Request):
     """
     Scan URL and return PDF report
     
     Note: This is a paid feature (₪99)
     For MVP, we'll return JSON and generate PDF on frontend
     """
+    request = await _decode_body(http_request, _scan_request_decoder)
     try:
         logger.info(f"Scanning URL for PDF: {request.url}")
         
-        from .scanner import scan_url
-        from .pdf_generator import generate_pdf_report
-        
         # Perform scan
-        results = await scan_url(
-            url=str(request.url),
+        results = await _cached_scan(
+            url=request.url,
             standard=request.standard,
             locale=request.locale
         )
         
-        # Generate PDF
-        pdf_bytes = generate_pdf_report(results)
-        
         # Sanitize scan_id for safe use in filename header
-        safe_id = "".join(c for c in results.get("scan_id", "report") if c.isalnum() or c in "-_")
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="accessibility-report-{safe_id}.pdf"'
-            }
-        )
+        safe_id = _safe_id(results.get("scan_id"))
+
+        # Serve an already-rendered copy of this report if there is one
+        pdf_bytes = _PDF_CACHE.get(_pdf_cache_key(results))
+        if pdf_bytes is not None:
+            return _pdf_response(pdf_bytes, safe_id)
+
+        # Generate PDF straight to disk; the response streams it from there
+        pdf_path = await _render_pdf_file(results)
+        return _pdf_file_response(pdf_path, safe_id)
         
     except Exception as e:
         logger.error(f"PDF generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail="PDF generation failed. Please try again.")
 
 
-@app.post("/api/v1/send-report")
-async def send_report_email(request: SendReportRequest):
+@app.post(
+    "/api/v1/send-report",
+    openapi_extra=_openapi_body(SendReportRequest, {
+        "url": "https://example.com",
+        "scan_id": "scan_abc123",
+        "email": "user@example.com"
+    }),
+)
+async def send_report_email(http_request: Request):
     """
     Scan URL, generate PDF, and send it via email.
     All in-memory – no data is persisted.
     """
+    request = await _decode_body(http_request, _send_report_decoder)
     try:
         logger.info(f"Generating and sending report for {request.url} to {request.email}")
 
-        from .scanner import scan_url
-        from .pdf_generator import generate_pdf_report
-
         # Scan
-        results = await scan_url(url=str(request.url))
+        results = await _cached_scan(url=request.url)
 
         # Generate PDF
-        pdf_bytes = generate_pdf_report(results)
+        pdf_bytes = await _render_pdf(results)
 
         # Send email
-        _send_email(
-            to_addr=str(request.email),
+        await _send_email(
+            to_addr=request.email,
             subject=f"דוח נגישות – {request.url}",
             html_body=_build_email_html(results),
             pdf_bytes=pdf_bytes,
-            pdf_filename=f"accessibility-report-{results['scan_id']}.pdf",
+            pdf_filename=f"accessibility-report-{_safe_id(results.get('scan_id'))}.pdf",
         )
 
-        return {"status": "sent", "email": str(request.email)}
+        return {"status": "sent", "email": request.email}
 
     except RuntimeError as e:
         # SMTP configuration errors — safe to expose
@@ -258,38 +625,25 @@ async def send_report_email(request: SendReportRequest):
 
 def _esc(value) -> str:
     """Escape HTML special characters to prevent injection."""
-    return str(value).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+    return html.escape(str(value))
 
 
-def _build_email_html(results: dict) -> str:
-    """Simple HTML email body with visual hierarchy."""
-    risk = results.get("risk", {})
-    level = risk.get("level", "MEDIUM")
-    level_he = _esc(risk.get("level_he", level))
-    score = int(results.get("score", 0))
-    summary = results.get("summary", {})
-    safe_url = _esc(results.get("url", ""))
-
-    risk_color = {
-        "LOW": "#059669", "MEDIUM": "#d97706",
-        "HIGH": "#dc2626", "CRITICAL": "#880000"
-    }.get(level, "#d97706")
-
-    return f"""\
+# Email body template, compiled once at import
+_EMAIL_TEMPLATE = string.Template("""\
 <div dir="rtl" style="font-family:Arial,sans-serif;max-width:600px;margin:0 auto;padding:24px">
   <h1 style="font-size:22px;color:#1a56db;border-bottom:2px solid #e5e7eb;padding-bottom:12px">
-    דוח נגישות – {safe_url}
+    דוח נגישות – $safe_url
   </h1>
 
   <table style="width:100%;border-collapse:collapse;margin:16px 0">
     <tr>
       <td style="padding:12px;background:#f9fafb;border-radius:8px;text-align:center;width:50%">
         <div style="font-size:12px;color:#6b7280">ציון נגישות</div>
-        <div style="font-size:32px;font-weight:bold;color:{risk_color}">{score}/100</div>
+        <div style="font-size:32px;font-weight:bold;color:$risk_color">$score/100</div>
       </td>
       <td style="padding:12px;background:#f9fafb;border-radius:8px;text-align:center;width:50%">
         <div style="font-size:12px;color:#6b7280">רמת סיכון</div>
-        <div style="font-size:20px;font-weight:bold;color:{risk_color}">{level_he}</div>
+        <div style="font-size:20px;font-weight:bold;color:$risk_color">$level_he</div>
       </td>
     </tr>
   </table>
@@ -297,56 +651,93 @@ def _build_email_html(results: dict) -> str:
   <h2 style="font-size:16px;color:#374151">סיכום ממצאים</h2>
   <table style="width:100%;border-collapse:collapse;margin-bottom:16px">
     <tr style="background:#e5e7eb"><th style="padding:8px">סוג</th><th style="padding:8px">כמות</th></tr>
-    <tr><td style="padding:8px;text-align:center">קריטי</td><td style="padding:8px;text-align:center;color:#dc2626;font-weight:bold">{summary.get('critical',0)}</td></tr>
-    <tr style="background:#f9fafb"><td style="padding:8px;text-align:center">חמור</td><td style="padding:8px;text-align:center;color:#d97706;font-weight:bold">{summary.get('serious',0)}</td></tr>
-    <tr><td style="padding:8px;text-align:center">בינוני</td><td style="padding:8px;text-align:center;color:#0891b2;font-weight:bold">{summary.get('moderate',0)}</td></tr>
-    <tr style="background:#f9fafb"><td style="padding:8px;text-align:center">קל</td><td style="padding:8px;text-align:center;color:#6b7280;font-weight:bold">{summary.get('minor',0)}</td></tr>
+    <tr><td style="padding:8px;text-align:center">קריטי</td><td style="padding:8px;text-align:center;color:#dc2626;font-weight:bold">$critical</td></tr>
+    <tr style="background:#f9fafb"><td style="padding:8px;text-align:center">חמור</td><td style="padding:8px;text-align:center;color:#d97706;font-weight:bold">$serious</td></tr>
+    <tr><td style="padding:8px;text-align:center">בינוני</td><td style="padding:8px;text-align:center;color:#0891b2;font-weight:bold">$moderate</td></tr>
+    <tr style="background:#f9fafb"><td style="padding:8px;text-align:center">קל</td><td style="padding:8px;text-align:center;color:#6b7280;font-weight:bold">$minor</td></tr>
   </table>
 
   <p style="font-size:13px;color:#6b7280;border-top:1px solid #e5e7eb;padding-top:12px">
     הדוח המלא מצורף כקובץ PDF.<br>
     מערכת זו אינה מהווה ייעוץ משפטי.
   </p>
-</div>"""
+</div>""")
+
+
+_SUMMARY_DEFAULTS = {"critical": 0, "serious": 0, "moderate": 0, "minor": 0}
+
+_RISK_COLORS = {
+    "LOW": "#059669", "MEDIUM": "#d97706",
+    "HIGH": "#dc2626", "CRITICAL": "#880000"
+}
+
+
+def _build_email_html(results: dict) -> str:
+    """Simple HTML email body with visual hierarchy."""
+    risk = results.get("risk") or {}
+    level = risk.get("level", "MEDIUM")
+
+    # Severity counts go straight into the template mapping
+    return _EMAIL_TEMPLATE.substitute(
+        {**_SUMMARY_DEFAULTS, **(results.get("summary") or {})},
+        safe_url=_esc(results.get("url", "")),
+        score=int(results.get("score", 0)),
+        level_he=_esc(risk.get("level_he", level)),
+        risk_color=_RISK_COLORS.get(level, "#d97706"),
+    )
 
 
-def _send_email(
+def _build_email_bytes(
+    from_addr: str,
     to_addr: str,
     subject: str,
     html_body: str,
     pdf_bytes: bytes,
     pdf_filename: str,
-):
-    """Send email via SMTP with PDF attachment. In-memory only."""
-    smtp_host = os.getenv("SMTP_HOST", "")
-    smtp_port = int(os.getenv("SMTP_PORT", "587"))
-    smtp_user = os.getenv("SMTP_USER", "")
-    smtp_pass = os.getenv("SMTP_PASS", "")
-    from_addr = os.getenv("SMTP_FROM", smtp_user)
-
-    if not smtp_host or not smtp_user or not smtp_pass:
-        raise RuntimeError(
-            "SMTP not configured. Set SMTP_HOST, SMTP_USER, SMTP_PASS env vars."
-        )
-
-    msg = MIMEMultipart()
+    body_cte: str = "base64",
+) -> bytes:
+    """Build and serialize the MIME message (base64-encodes the PDF)."""
+    msg = EmailMessage()
     msg["From"] = from_addr
     msg["To"] = to_addr
     msg["Subject"] = subject
 
-    msg.attach(MIMEText(html_body, "html", "utf-8"))
+    msg.set_content(html_body, subtype="html", charset="utf-8", cte=body_cte)
 
     # Attach PDF with safe ASCII filename
-    attachment = MIMEApplication(pdf_bytes, _subtype="pdf")
-    attachment.add_header(
-        "Content-Disposition", "attachment", filename=pdf_filename
+    msg.add_attachment(
+        pdf_bytes, maintype="application", subtype="pdf", filename=pdf_filename
     )
-    msg.attach(attachment)
 
-    with smtplib.SMTP(smtp_host, smtp_port) as server:
-        server.starttls()
-        server.login(smtp_user, smtp_pass)
-        server.send_message(msg)
+    # Serialize once; sendmail ships the bytes without re-walking the MIME tree
+    return msg.as_bytes(policy=SMTP_POLICY)
+
+
+async def _send_email(
+    to_addr: str,
+    subject: str,
+    html_body: str,
+    pdf_bytes: bytes,
+    pdf_filename: str,
+):
+    """Send email via SMTP with PDF attachment. In-memory only."""
+    pool = _get_smtp_pool()
+    from_addr = os.getenv("SMTP_FROM", pool.user)
+
+    # The Hebrew HTML body can go as raw UTF-8 when the relay accepts 8-bit
+    # data. The PDF stays base64: arbitrary binary needs BINARYMIME, which
+    # requires BDAT/CHUNKING that aiosmtplib doesn't implement.
+    eightbit = bool(pool.supports_8bitmime)
+
+    # Encoding a multi-hundred-KB PDF is CPU work; keep it off the event loop
+    message = await asyncio.to_thread(
+        _build_email_bytes, from_addr, to_addr, subject, html_body, pdf_bytes, pdf_filename,
+        "8bit" if eightbit else "base64",
+    )
+    await pool.sendmail(
+        from_addr, [to_addr], message,
+        mail_options=["BODY=8BITMIME"] if eightbit else (),
+    )
 
     logger.info(f"Email sent to {to_addr}")
 
@@ -375,11 +766,78 @@ async def create_payment(request: CreatePaymentRequest):
         raise HTTPException(status_code=500, detail="Failed to create payment session.")
 
 
+# Post-payment scan → PDF → email jobs running in this process  {session_id: task}.
+# Only keeps the tasks referenced; which worker runs a session's job is
+# decided by payment_service.claim_finalize in the shared store.
+_finalize_tasks: dict[str, asyncio.Task] = {}
+
+# How long a download waits for an in-progress finalize before rendering itself
+_FINALIZE_WAIT = 120.0
+# How often a waiting download re-checks the shared store for the PDF
+_FINALIZE_POLL = 0.5
+
+
+async def _deliver_report(session_id: str, scan_url: str, email: str):
+    """Scan, render, store and email the report for a paid session."""
+    # Usually a cache hit: the user scanned this URL right before paying
+    scan_results = await _cached_scan(scan_url)
+    pdf_bytes = await _render_pdf(scan_results)
+    await payment_service.store_scan(session_id, scan_results)
+    await payment_service.store_pdf(session_id, pdf_bytes)
+
+    try:
+        _get_smtp_pool()
+    except RuntimeError as e:
+        # Retrying can't help until SMTP is configured; the PDF is downloadable
+        logger.warning(f"Report for session {session_id} not emailed: {e}")
+        return
+
+    await _send_email(
+        to_addr=email,
+        subject=f"דוח נגישות – {scan_url}",
+        html_body=_build_email_html(scan_results),
+        pdf_bytes=pdf_bytes,
+        pdf_filename=f"accessibility-report-{_safe_id(scan_results.get('scan_id'))}.pdf",
+    )
+    logger.info(f"Report emailed to {email} for session {session_id}")
+
+
+async def _finalize_payment(session_id: str, scan_url: str, email: str):
+    """
+    Run the post-payment job for a session whose finalize claim we hold.
+    Marked done only once the report went out; on failure the claim is
+    released so the next verify poll retries it.
+    """
+    try:
+        await _deliver_report(session_id, scan_url, email)
+    except Exception as e:
+        logger.error(f"Finalizing paid session {session_id} failed, will retry: {e}")
+        await payment_service.release_finalize(session_id)
+    else:
+        await payment_service.finish_finalize(session_id)
+
+
+async def _wait_for_finalized_pdf(session_id: str) -> Optional[bytes]:
+    """
+    While any worker's finalize job for the session is running, poll the
+    shared store for its PDF (up to _FINALIZE_WAIT); returns it or None.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _FINALIZE_WAIT
+    while await payment_service.finalize_state(session_id) == FINALIZE_RUNNING:
+        pdf_bytes = await payment_service.get_cached_pdf(session_id)
+        if pdf_bytes or loop.time() >= deadline:
+            return pdf_bytes
+        await asyncio.sleep(_FINALIZE_POLL)
+    return await payment_service.get_cached_pdf(session_id)
+
+
 @app.get("/api/v1/payment/verify/{session_id}")
 async def verify_payment(session_id: str):
     """
-    Verify payment for a session. On success, generates PDF and sends email.
-    Returns pdf_token for secure download.
+    Verify payment for a session. On success, starts PDF generation and the
+    report email in the background and returns immediately.
+    Returns pdf_token for secure download, plus pdf_ready.
     """
     try:
         result = await payment_service.verify_session(session_id)
@@ -387,33 +845,17 @@ async def verify_payment(session_id: str):
         if result["status"] == "not_found":
             raise HTTPException(status_code=404, detail="Payment session not found.")
 
-        # If payment just completed, generate PDF and send email
+        result["pdf_ready"] = False
         if result["status"] == "completed" and result["pdf_token"]:
-            session = payment_service._sessions.get(session_id)
-            if session and not session.get("pdf_bytes"):
-                try:
-                    from .scanner import scan_url
-                    from .pdf_generator import generate_pdf_report
-
-                    scan_results = await scan_url(url=result["scan_url"])
-                    pdf_bytes = generate_pdf_report(scan_results)
-                    payment_service.store_pdf(session_id, pdf_bytes)
-
-                    # Auto-send email with PDF
-                    try:
-                        _send_email(
-                            to_addr=result["email"],
-                            subject=f"דוח נגישות – {result['scan_url']}",
-                            html_body=_build_email_html(scan_results),
-                            pdf_bytes=pdf_bytes,
-                            pdf_filename=f"accessibility-report-{scan_results.get('scan_id', 'report')}.pdf",
-                        )
-                        logger.info(f"Report emailed to {result['email']} for session {session_id}")
-                    except Exception as email_err:
-                        logger.error(f"Email send failed (payment still valid): {email_err}")
-
-                except Exception as scan_err:
-                    logger.error(f"PDF generation during verify failed: {scan_err}")
+            result["pdf_ready"] = bool(await payment_service.get_cached_pdf(session_id))
+            # The claim is shared by all workers: one job per session, and
+            # none once a previous one delivered the report
+            if await payment_service.claim_finalize(session_id):
+                task = asyncio.create_task(
+                    _finalize_payment(session_id, result["scan_url"], result["email"])
+                )
+                _finalize_tasks[session_id] = task
+                task.add_done_callback(lambda _t: _finalize_tasks.pop(session_id, None))
 
         return result
 
@@ -430,34 +872,34 @@ async def download_pdf_by_token(pdf_token: str):
     Download PDF report using a one-time token from payment verification.
     Token expires after 30 minutes.
     """
-    session = payment_service.get_session_by_token(pdf_token)
+    session = await payment_service.get_session_by_token(pdf_token)
     if not session:
         raise HTTPException(status_code=404, detail="Invalid or expired download token.")
 
-    pdf_bytes = session.get("pdf_bytes")
+    session_id = session["session_id"]
+    pdf_bytes = await payment_service.get_cached_pdf(session_id)
+
     if not pdf_bytes:
-        # PDF not cached — regenerate
-        try:
-            from .scanner import scan_url
-            from .pdf_generator import generate_pdf_report
+        # Report may still be generating after payment, on any worker — wait for it
+        pdf_bytes = await _wait_for_finalized_pdf(session_id)
 
-            scan_results = await scan_url(url=session["url"])
-            pdf_bytes = generate_pdf_report(scan_results)
-            payment_service.store_pdf(session["session_id"], pdf_bytes)
+    if not pdf_bytes:
+        # PDF not cached — regenerate, from the stored scan if there is one
+        try:
+            scan_results = await payment_service.get_scan(session_id)
+            if scan_results is None:
+                scan_results = await _cached_scan(session["url"])
+                await payment_service.store_scan(session_id, scan_results)
+            pdf_bytes = await _render_pdf(scan_results)
+            await payment_service.store_pdf(session_id, pdf_bytes)
         except Exception as e:
             logger.error(f"PDF regeneration failed: {e}")
             raise HTTPException(status_code=500, detail="PDF generation failed.")
 
-    safe_id = "".join(
-        c for c in session.get("scan_id", "report") if c.isalnum() or c in "-_"
-    )
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="accessibility-report-{safe_id}.pdf"'
-        },
-    )
+    safe_id = _safe_id(session.get("scan_id"))
+    # Runs after the body is sent; may release the cached PDF bytes
+    done = BackgroundTask(payment_service.record_download, session_id)
+    return _pdf_response(pdf_bytes, safe_id, background=done)
 
 
 @app.post("/api/v1/payment/webhook")
@@ -467,7 +909,7 @@ async def payment_webhook(request: Request):
     Updates session status when payment completes.
     """
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
         logger.info(f"Payment webhook received: {data}")
         success = await payment_service.handle_webhook(data)
         return {"status": "ok", "processed": success}
@@ -492,7 +934,7 @@ async def payment_system_status():
 # Error handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail}
     )
@@ -501,7 +943,7 @@ async def http_exception_handler(request, exc):
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {str(exc)}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error"}
     )
@@ -509,4 +951,17 @@ async def general_exception_handler(request, exc):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # With REDIS_URL, payment state is shared and every core can serve
+    # requests; otherwise sessions live in process memory, so default to one.
+    default_workers = (os.cpu_count() or 2) if os.getenv("REDIS_URL") else 1
+    workers = int(os.getenv("WEB_CONCURRENCY", default_workers))
+    # Worker processes re-import this module; they size their PDF pools from it
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "app.main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+    )
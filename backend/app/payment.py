@@ -3,16 +3,168 @@ Payment Service for Israeli Accessibility Scanner
 Handles Grow/Meshulam payment gateway integration with demo mode fallback.
 """
 
+import base64
+import hashlib
+import hmac
 import os
 import secrets
 import logging
+import heapq
 import time
 from datetime import datetime, timezone
 from typing import Optional
 
+import httpx
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
+SESSION_TTL = 7200  # 2 hours
+TOKEN_TTL = 1800  # 30 minutes
+PDF_CACHED_DOWNLOADS = 2  # Cached PDF bytes are dropped after this many downloads
+FINALIZE_CLAIM_TTL = 600  # A finalize claim whose worker died frees up after 10 minutes
+
+# Post-payment finalize state, one per session (see PaymentService.claim_finalize)
+FINALIZE_RUNNING = "running"
+FINALIZE_DONE = "done"
+
+
+class _MemorySessionStore:
+    """Process-local session store. Used when REDIS_URL is not set."""
+
+    def __init__(self):
+        # In-memory session store  {session_id: dict}
+        self._sessions: dict[str, dict] = {}
+        # Generated PDFs  {session_id: bytes}
+        self._pdfs: dict[str, bytes] = {}
+        # Scan results behind each PDF  {session_id: dict}
+        self._scans: dict[str, dict] = {}
+        # Finalize state per session  {session_id: (state, expires_at)}
+        self._finalize: dict[str, tuple[str, float]] = {}
+        # Min-heap of (expires_at, session_id) so cleanup only touches expired entries
+        self._expiry: list[tuple[float, str]] = []
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        return self._sessions.get(session_id)
+
+    async def put(self, session: dict):
+        sid = session["session_id"]
+        if sid not in self._sessions:
+            heapq.heappush(self._expiry, (session["expires_at"], sid))
+        self._sessions[sid] = session
+
+    async def get_pdf(self, session_id: str) -> Optional[bytes]:
+        return self._pdfs.get(session_id)
+
+    async def put_pdf(self, session_id: str, pdf_bytes: bytes):
+        if session_id in self._sessions:
+            self._pdfs[session_id] = pdf_bytes
+
+    async def delete_pdf(self, session_id: str):
+        self._pdfs.pop(session_id, None)
+
+    async def get_scan(self, session_id: str) -> Optional[dict]:
+        return self._scans.get(session_id)
+
+    async def put_scan(self, session_id: str, results: dict):
+        if session_id in self._sessions:
+            self._scans[session_id] = results
+
+    async def get_finalize(self, session_id: str) -> Optional[str]:
+        entry = self._finalize.get(session_id)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    async def claim_finalize(self, session_id: str, ttl: int) -> bool:
+        if await self.get_finalize(session_id) is not None:
+            return False
+        self._finalize[session_id] = (FINALIZE_RUNNING, time.time() + ttl)
+        return True
+
+    async def set_finalize(self, session_id: str, state: str, ttl: int):
+        self._finalize[session_id] = (state, time.time() + ttl)
+
+    async def delete_finalize(self, session_id: str):
+        self._finalize.pop(session_id, None)
+
+    def cleanup(self):
+        """Remove sessions older than 2 hours to prevent memory leaks."""
+        now = time.time()
+        expired = 0
+
+        while self._expiry and self._expiry[0][0] <= now:
+            _, sid = heapq.heappop(self._expiry)
+            session = self._sessions.pop(sid, None)
+            if session is None:
+                continue
+            expired += 1
+            self._pdfs.pop(sid, None)
+            self._scans.pop(sid, None)
+            self._finalize.pop(sid, None)
+
+        if expired:
+            logger.info(f"Cleaned up {expired} expired payment sessions")
+
+
+class _RedisSessionStore:
+    """
+    Redis-backed session store shared by all workers.
+    Keys expire on their own, so no cleanup sweep is needed.
+    """
+
+    def __init__(self, redis_url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(redis_url)
+
+    async def get(self, session_id: str) -> Optional[dict]:
+        raw = await self._redis.get(f"pay:{session_id}")
+        return orjson.loads(raw) if raw else None
+
+    async def put(self, session: dict):
+        await self._redis.set(
+            f"pay:{session['session_id']}", orjson.dumps(session), ex=SESSION_TTL
+        )
+
+    async def get_pdf(self, session_id: str) -> Optional[bytes]:
+        return await self._redis.get(f"pdfbytes:{session_id}")
+
+    async def put_pdf(self, session_id: str, pdf_bytes: bytes):
+        await self._redis.set(f"pdfbytes:{session_id}", pdf_bytes, ex=TOKEN_TTL)
+
+    async def delete_pdf(self, session_id: str):
+        await self._redis.delete(f"pdfbytes:{session_id}")
+
+    async def get_scan(self, session_id: str) -> Optional[dict]:
+        raw = await self._redis.get(f"scan:{session_id}")
+        return orjson.loads(raw) if raw else None
+
+    async def put_scan(self, session_id: str, results: dict):
+        await self._redis.set(f"scan:{session_id}", orjson.dumps(results), ex=TOKEN_TTL)
+
+    async def get_finalize(self, session_id: str) -> Optional[str]:
+        raw = await self._redis.get(f"fin:{session_id}")
+        return raw.decode() if raw else None
+
+    async def claim_finalize(self, session_id: str, ttl: int) -> bool:
+        # SET NX: exactly one worker wins, however many polls race here
+        return bool(await self._redis.set(f"fin:{session_id}", FINALIZE_RUNNING, nx=True, ex=ttl))
+
+    async def set_finalize(self, session_id: str, state: str, ttl: int):
+        await self._redis.set(f"fin:{session_id}", state, ex=ttl)
+
+    async def delete_finalize(self, session_id: str):
+        await self._redis.delete(f"fin:{session_id}")
+
+    def cleanup(self):
+        pass
+
+    async def aclose(self):
+        await self._redis.aclose()
+
+
 class PaymentService:
     """
     Manages payment sessions, Meshulam API integration, and token-based PDF access.
@@ -39,10 +191,27 @@ class PaymentService:
         # Demo mode when no Meshulam credentials configured
         self.demo_mode = not bool(self.page_code)
 
-        # In-memory session store  {session_id: dict}
-        self._sessions: dict[str, dict] = {}
-        # Token → session_id mapping  {pdf_token: session_id}
-        self._tokens: dict[str, str] = {}
+        # PDF download tokens are HMAC-signed, so no token → session map is kept.
+        # Without a configured secret, tokens only survive this process.
+        secret = os.getenv("PDF_TOKEN_SECRET", "")
+        self._token_key = secret.encode() if secret else secrets.token_bytes(32)
+
+        self._base_url = (
+            "https://sandbox.meshulam.co.il"
+            if self.sandbox
+            else "https://secure.meshulam.co.il"
+        )
+        # Shared keep-alive client, created on first Meshulam call
+        self._http: Optional[httpx.AsyncClient] = None
+
+        # Session/token/PDF storage: Redis when configured (shared across
+        # workers), otherwise process memory
+        redis_url = os.getenv("REDIS_URL", "")
+        if redis_url:
+            self._store = _RedisSessionStore(redis_url)
+            logger.info("PaymentService using Redis session store")
+        else:
+            self._store = _MemorySessionStore()
 
         # Production safety: warn loudly if demo mode is on with production URLs
         if self.demo_mode:
@@ -80,9 +249,9 @@ class PaymentService:
             "meshulam_process_id": None,
             "payment_url": None,
             "created_at": datetime.now(timezone.utc).isoformat(),
+            "expires_at": time.time() + SESSION_TTL,
             "completed_at": None,
             "pdf_token": None,
-            "pdf_bytes": None,  # Cached after generation
             "demo_mode": self.demo_mode,
         }
 
@@ -92,7 +261,7 @@ class PaymentService:
             payment_url = await self._create_meshulam_payment(session)
 
         session["payment_url"] = payment_url
-        self._sessions[session_id] = session
+        await self._store.put(session)
 
         logger.info(
             f"Payment session created: {session_id} | "
@@ -109,7 +278,7 @@ class PaymentService:
         """
         Verify payment was completed. Returns status + pdf_token on success.
         """
-        session = self._sessions.get(session_id)
+        session = await self._store.get(session_id)
         if not session:
             return {"status": "not_found", "pdf_token": None, "email": "", "scan_url": ""}
 
@@ -130,12 +299,9 @@ class PaymentService:
             verified = await self._verify_meshulam_payment(session)
 
         if verified:
-            # Generate one-time PDF token
-            pdf_token = secrets.token_urlsafe(32)
-            session["status"] = "completed"
-            session["completed_at"] = datetime.now(timezone.utc).isoformat()
-            session["pdf_token"] = pdf_token
-            self._tokens[pdf_token] = session_id
+            # Generate signed PDF download token
+            pdf_token = self._complete(session)
+            await self._store.put(session)
 
             logger.info(f"Payment verified: {session_id} | token generated")
 
@@ -155,50 +321,79 @@ class PaymentService:
             "demo_mode": session["demo_mode"],
         }
 
-    def get_session_by_token(self, pdf_token: str) -> Optional[dict]:
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        """Look up a payment session by id."""
+        return await self._store.get(session_id)
+
+    async def get_session_by_token(self, pdf_token: str) -> Optional[dict]:
         """
         Look up a session by its PDF download token.
         Returns session dict if token is valid and not expired, else None.
-        Token allows up to 3 uses within 30 minutes.
+        Tokens are HMAC-signed and valid for 30 minutes after payment.
         """
-        session_id = self._tokens.get(pdf_token)
+        session_id = self._verify_token(pdf_token)
         if not session_id:
             return None
 
-        session = self._sessions.get(session_id)
+        session = await self._store.get(session_id)
         if not session:
             return None
 
         if session["status"] != "completed":
             return None
 
-        # Check expiry (30 min from completion)
-        completed_at = session.get("completed_at", "")
-        if completed_at:
-            try:
-                completed_time = datetime.fromisoformat(completed_at)
-                elapsed = (datetime.now(timezone.utc) - completed_time).total_seconds()
-                if elapsed > 1800:  # 30 minutes
-                    logger.info(f"Token expired: {pdf_token[:8]}...")
-                    del self._tokens[pdf_token]
-                    return None
-            except (ValueError, TypeError):
-                pass
-
         return session
 
-    def store_pdf(self, session_id: str, pdf_bytes: bytes):
-        """Cache generated PDF bytes in the session for download."""
-        session = self._sessions.get(session_id)
-        if session:
-            session["pdf_bytes"] = pdf_bytes
+    async def store_pdf(self, session_id: str, pdf_bytes: bytes):
+        """Cache generated PDF bytes for the session's download."""
+        await self._store.put_pdf(session_id, pdf_bytes)
 
-    def get_cached_pdf(self, session_id: str) -> Optional[bytes]:
+    async def get_cached_pdf(self, session_id: str) -> Optional[bytes]:
         """Retrieve cached PDF bytes for a session."""
-        session = self._sessions.get(session_id)
-        if session:
-            return session.get("pdf_bytes")
-        return None
+        return await self._store.get_pdf(session_id)
+
+    async def record_download(self, session_id: str):
+        """
+        Count a finished PDF download and release the cached bytes once the
+        report has been fetched PDF_CACHED_DOWNLOADS times. Later downloads
+        rebuild it from the stored scan results.
+        """
+        session = await self._store.get(session_id)
+        if not session:
+            return
+        session["download_count"] = session.get("download_count", 0) + 1
+        await self._store.put(session)
+        if session["download_count"] >= PDF_CACHED_DOWNLOADS:
+            await self._store.delete_pdf(session_id)
+
+    async def store_scan(self, session_id: str, results: dict):
+        """Keep the scan results so the PDF can be rebuilt without rescanning."""
+        await self._store.put_scan(session_id, results)
+
+    async def get_scan(self, session_id: str) -> Optional[dict]:
+        """Retrieve stored scan results for a session."""
+        return await self._store.get_scan(session_id)
+
+    async def claim_finalize(self, session_id: str) -> bool:
+        """
+        Claim the post-payment scan → PDF → email job for a session.
+        Atomic in the shared store, so across all workers only one caller
+        gets True until the job fails (release_finalize) or the claim
+        expires after FINALIZE_CLAIM_TTL. Always False once finished.
+        """
+        return await self._store.claim_finalize(session_id, FINALIZE_CLAIM_TTL)
+
+    async def finish_finalize(self, session_id: str):
+        """Mark the session's report as delivered; it is never finalized again."""
+        await self._store.set_finalize(session_id, FINALIZE_DONE, SESSION_TTL)
+
+    async def release_finalize(self, session_id: str):
+        """Drop a failed claim so the next verify poll retries the job."""
+        await self._store.delete_finalize(session_id)
+
+    async def finalize_state(self, session_id: str) -> Optional[str]:
+        """FINALIZE_RUNNING, FINALIZE_DONE, or None if never (or no longer) claimed."""
+        return await self._store.get_finalize(session_id)
 
     async def handle_webhook(self, data: dict) -> bool:
         """
@@ -212,18 +407,15 @@ class PaymentService:
             logger.warning("Webhook received without external identifier")
             return False
 
-        session = self._sessions.get(external_id)
+        session = await self._store.get(external_id)
         if not session:
             logger.warning(f"Webhook for unknown session: {external_id}")
             return False
 
         if status_code == "1":  # Success
             if session["status"] != "completed":
-                pdf_token = secrets.token_urlsafe(32)
-                session["status"] = "completed"
-                session["completed_at"] = datetime.now(timezone.utc).isoformat()
-                session["pdf_token"] = pdf_token
-                self._tokens[pdf_token] = external_id
+                self._complete(session)
+                await self._store.put(session)
                 logger.info(f"Webhook confirmed payment: {external_id}")
             return True
 
@@ -236,14 +428,7 @@ class PaymentService:
 
     async def _create_meshulam_payment(self, session: dict) -> str:
         """Call Meshulam createPaymentProcess API."""
-        import httpx
-
-        base_url = (
-            "https://sandbox.meshulam.co.il"
-            if self.sandbox
-            else "https://secure.meshulam.co.il"
-        )
-        endpoint = f"{base_url}/api/light/server/1.0/createPaymentProcess"
+        endpoint = "/api/light/server/1.0/createPaymentProcess"
 
         success_url = (
             f"{self.frontend_url}/payment-success.html"
@@ -266,10 +451,9 @@ class PaymentService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(endpoint, data=payload, timeout=15.0)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await self._client().post(endpoint, data=payload)
+            resp.raise_for_status()
+            data = resp.json()
 
             if data.get("status") != 1:
                 err_msg = data.get("err", {}).get("message", "Unknown Meshulam error")
@@ -287,18 +471,11 @@ class PaymentService:
 
     async def _verify_meshulam_payment(self, session: dict) -> bool:
         """Call Meshulam getPaymentProcessInfo to verify payment."""
-        import httpx
-
         process_id = session.get("meshulam_process_id")
         if not process_id:
             return False
 
-        base_url = (
-            "https://sandbox.meshulam.co.il"
-            if self.sandbox
-            else "https://secure.meshulam.co.il"
-        )
-        endpoint = f"{base_url}/api/light/server/1.0/getPaymentProcessInfo"
+        endpoint = "/api/light/server/1.0/getPaymentProcessInfo"
 
         payload = {
             "pageCode": self.page_code,
@@ -308,10 +485,9 @@ class PaymentService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(endpoint, data=payload, timeout=15.0)
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await self._client().post(endpoint, data=payload)
+            resp.raise_for_status()
+            data = resp.json()
 
             if data.get("status") != 1:
                 return False
@@ -324,6 +500,25 @@ class PaymentService:
             logger.error(f"Meshulam verify error: {e}")
             return False
 
+    def _client(self) -> httpx.AsyncClient:
+        """Return the shared Meshulam client so TCP+TLS is reused across calls."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self._base_url,
+                http2=True,
+                timeout=15.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+        return self._http
+
+    async def aclose(self):
+        """Close the shared HTTP client and Redis connection (call on app shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if isinstance(self._store, _RedisSessionStore):
+            await self._store.aclose()
+
     # ------------------------------------------------------------------ #
     #  Demo mode
     # ------------------------------------------------------------------ #
@@ -339,31 +534,42 @@ class PaymentService:
     #  Helpers
     # ------------------------------------------------------------------ #
 
+    def _complete(self, session: dict) -> str:
+        """Mark a session paid and issue its PDF token (valid for TOKEN_TTL)."""
+        pdf_token = self._sign_token(session["session_id"], int(time.time()) + TOKEN_TTL)
+        session["status"] = "completed"
+        session["completed_at"] = datetime.now(timezone.utc).isoformat()
+        session["pdf_token"] = pdf_token
+        return pdf_token
+
+    def _token_sig(self, payload: str) -> str:
+        digest = hmac.new(self._token_key, payload.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def _sign_token(self, session_id: str, expires: int) -> str:
+        payload = f"{session_id}.{expires}"
+        return f"{payload}.{self._token_sig(payload)}"
+
+    def _verify_token(self, pdf_token: str) -> Optional[str]:
+        """Return the session_id of a valid, unexpired token, else None."""
+        try:
+            session_id, expires, sig = pdf_token.split(".")
+            expires_at = int(expires)
+        except ValueError:
+            return None
+        # Bytes, not str: compare_digest raises TypeError on non-ASCII str
+        expected = self._token_sig(f"{session_id}.{expires}").encode()
+        if not hmac.compare_digest(sig.encode(), expected):
+            return None
+        if time.time() > expires_at:
+            logger.info(f"Token expired: {pdf_token[:8]}...")
+            return None
+        return session_id
+
     def is_production_safe(self) -> bool:
         """Check if demo mode is OFF (real payments configured)."""
         return not self.demo_mode
 
     def _cleanup_expired(self):
-        """Remove sessions older than 2 hours to prevent memory leaks."""
-        now = time.time()
-        cutoff = 7200  # 2 hours in seconds
-        expired = []
-
-        for sid, session in self._sessions.items():
-            created = session.get("created_at", "")
-            try:
-                created_dt = datetime.fromisoformat(created)
-                elapsed = (datetime.now(timezone.utc) - created_dt).total_seconds()
-                if elapsed > cutoff:
-                    expired.append(sid)
-            except (ValueError, TypeError):
-                expired.append(sid)
-
-        for sid in expired:
-            session = self._sessions.pop(sid, {})
-            token = session.get("pdf_token")
-            if token:
-                self._tokens.pop(token, None)
-
-        if expired:
-            logger.info(f"Cleaned up {len(expired)} expired payment sessions")
+        """Drop expired sessions (no-op for Redis, where keys carry a TTL)."""
+        self._store.cleanup()
@@ -14,15 +14,23 @@ Structure:
   8. Legal disclaimer + signature
 """
 
-from weasyprint import HTML
-from io import BytesIO
-from datetime import datetime
-from typing import Dict, Any, List
+from datetime import date, datetime
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Any, List, Optional, Union, BinaryIO
+import base64
 import logging
+import os
+import re
 import html as html_module
 
 logger = logging.getLogger(__name__)
 
+# WeasyPrint logs every rendering step (and every laid-out page) at INFO;
+# keep that chatter out of production logs unless PDF_DEBUG is set
+if not os.getenv("PDF_DEBUG"):
+    logging.getLogger("weasyprint.progress").setLevel(logging.WARNING)
+
 # ---------------------------------------------------------------------------
 # Hebrew copy
 # ---------------------------------------------------------------------------
@@ -54,6 +62,14 @@ CHECKED_KEYS_MAP = {
     "FOCUS_VISIBLE": "נראות פוקוס",
 }
 
+# The copy above is constant, so it is HTML-escaped once here rather than on
+# every report
+RISK_COPY_HTML = {
+    level: {key: html_module.escape(text) for key, text in copy.items()}
+    for level, copy in RISK_COPY.items()
+}
+CHECKED_KEYS_HTML = {key: html_module.escape(label) for key, label in CHECKED_KEYS_MAP.items()}
+
 SEVERITY_LABELS = {
     "critical": "קריטי",
     "serious": "חמור",
@@ -61,6 +77,9 @@ SEVERITY_LABELS = {
     "minor": "קל",
 }
 
+# Sort rank for detailed findings, most severe first; unknown impacts last
+SEVERITY_ORDER = {"critical": 0, "serious": 1, "moderate": 2, "minor": 3}
+
 SEVERITY_COLORS = {
     "critical": "#dc2626",
     "serious": "#d97706",
@@ -68,38 +87,165 @@ SEVERITY_COLORS = {
     "minor": "#6b7280",
 }
 
+# Per-severity issue opening tag and badge, so each finding needs one lookup
+SEVERITY_MARKUP = {
+    key: (
+        f'<div class="issue sev-{key}">\n',
+        f'<span class="severity-badge">{label}</span>',
+    )
+    for key, label in SEVERITY_LABELS.items()
+}
+
+RISK_COLORS = {
+    "LOW": "#059669",
+    "MEDIUM": "#d97706",
+    "HIGH": "#dc2626",
+    "CRITICAL": "#880000",
+}
+
+# (minimum score, band, color), highest band first; below all bands is poor
+SCORE_BANDS = ((80, "good", "#059669"), (60, "fair", "#d97706"))
+SCORE_FLOOR = ("poor", "#dc2626")
+
+# Static sections, identical in every report
+LEGAL_OVERVIEW_HTML = """
+    <div class="page-break"></div>
+    <h2>סקירה משפטית</h2>
+    <p>
+      חוק שוויון זכויות לאנשים עם מוגבלות (תיקון מס' 15) מחייב כל גוף
+      להנגיש את שירותי האינטרנט שלו בהתאם לתקן הישראלי 5568.
+      התקן מבוסס על הנחיות WCAG 2.2 ברמה AA.
+      אי-עמידה בתקן עלולה להוביל לתביעות אזרחיות, קנסות מנהליים
+      ופגיעה במוניטין.
+    </p>
+    <ul class="legal-list">
+      <li>הנגשת האתר לפי WCAG 2.2 AA.</li>
+      <li>פרסום הצהרת נגישות באתר.</li>
+      <li>מינוי רכז/ת נגישות.</li>
+      <li>ביצוע סקר נגישות תקופתי.</li>
+    </ul>
+    """
+
+RESOURCES_HTML = """
+    <div class="resources-section">
+      <h2>מקורות מידע נוספים</h2>
+      <p class="resources-links">
+        <a href="https://www.w3.org/WAI/WCAG22/quickref/">WCAG 2.2 Guidelines</a> |
+        <a href="https://www.nevo.co.il/law_html/law01/999_969.htm">חוק הנגישות הישראלי</a> |
+        <a href="https://www.gov.il/he/departments/topics/accessibility">נגישות – אתר ממשלתי</a>
+      </p>
+    </div>
+    """
+
+# Shown instead of a coverage claim when axe ran only the quick rule subset
+# (coverage.mode "subset"); such a scan must not read as a compliance check
+SUBSET_NOTICE_HTML = (
+    "<p><strong>סריקה חלקית:</strong> נבדקו רק הכללים המפורטים למטה, ולא מלוא "
+    "כללי WCAG. אין לראות בדו\"ח זה אישור עמידה בתקן.</p>"
+)
+
+# Checks automation can't cover; the list never changes, so render it once
+MANUAL_CHECKS_HTML = "".join(
+    f"<li>✖ {item}</li>\n"
+    for item in (
+        "איכות תיאורים חלופיים",
+        "כתוביות לוידאו",
+        "חווית קורא מסך",
+        "בהירות תוכן וקישורים",
+    )
+)
+
+# Next-step recommendations per risk level
+RECOMMENDATIONS = {
+    "CRITICAL": (
+        "פנה מיידית לבודק נגישות מוסמך לבדיקה מקיפה.",
+        "טפל בליקויים הקריטיים בהקדם האפשרי.",
+        "שקול התייעצות משפטית בנושא חשיפה לתביעות.",
+        "הכן תוכנית תיקון עם לוחות זמנים ברורים.",
+    ),
+    "HIGH": (
+        "טפל בליקויים הקריטיים והחמורים בהקדם.",
+        "בצע בדיקה ידנית מקצועית.",
+        "הכן תוכנית תיקון עם לוחות זמנים.",
+        "שקול הכשרת צוות בנושאי נגישות.",
+    ),
+    "MEDIUM": (
+        "טפל בליקויים שנמצאו כדי להפחית חשיפה.",
+        "בצע בדיקה ידנית להשלמת הכיסוי.",
+        "שלב בדיקות נגישות בתהליך הפיתוח.",
+    ),
+    "LOW": (
+        "המשך לתחזק את רמת הנגישות הקיימת.",
+        "בצע בדיקות תקופתיות.",
+        "שלב בדיקות נגישות אוטומטיות ב-CI/CD.",
+    ),
+}
+
+# The recommendations section depends only on the risk level, so each
+# variant is rendered once at import
+def _recommendations_section(steps) -> str:
+    items = "".join(f"<li>{step}</li>\n" for step in steps)
+    return f"""
+    <h2>המלצות לצעדים הבאים</h2>
+    <ol class="recommendations-list">{items}</ol>
+    """
+
+
+RECOMMENDATIONS_HTML = {
+    level: _recommendations_section(steps) for level, steps in RECOMMENDATIONS.items()
+}
+
+# Static markup for each summary-table row, up to the count cell
+SUMMARY_ROW_PREFIXES = tuple(
+    (key, f'<tr><td>{SEVERITY_LABELS[key]}</td><td class="sev-count-{key}">')
+    for key in ("critical", "serious", "moderate", "minor")
+)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
-def _esc(value) -> str:
-    """Escape HTML special characters."""
-    return html_module.escape(str(value))
+def _esc(value, _escape=html_module.escape) -> str:
+    """Escape HTML special characters in element text.
+
+    Every call site interpolates into element content, never an attribute,
+    so quotes are left alone (quote=False skips two replace passes).
+    """
+    if type(value) is str:
+        return _escape(value, quote=False)
+    if value is None:
+        return ""
+    if type(value) is int:
+        return str(value)  # digits never need escaping
+    return _escape(str(value), quote=False)
+
+
+# Date and hour:minute of an ISO-8601 timestamp, e.g. "2024-05-01T09:30..."
+_ISO_PREFIX_RE = re.compile(r"(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d)")
 
 
 def _fmt_date(ts: str) -> str:
+    if not isinstance(ts, str):
+        return ts
+    # Scanner timestamps are well-formed ISO-8601: rearrange the fields
+    # directly instead of a full fromisoformat parse and strftime
+    m = _ISO_PREFIX_RE.match(ts)
+    if m:
+        year, month, day, hour, minute = m.groups()
+        return f"{day}/{month}/{year} {hour}:{minute}"
+    # Otherwise let fromisoformat try; only a trailing "Z" needs rewriting
+    iso = ts[:-1] + "+00:00" if ts.endswith("Z") else ts
     try:
-        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-        return dt.strftime("%d/%m/%Y %H:%M")
-    except Exception:
+        return datetime.fromisoformat(iso).strftime("%d/%m/%Y %H:%M")
+    except ValueError:
         return ts
 
 
-def _score_color(score: int) -> str:
-    if score >= 80:
-        return "#059669"
-    if score >= 60:
-        return "#d97706"
-    return "#dc2626"
-
-
-def _risk_color(level: str) -> str:
-    return {
-        "LOW": "#059669",
-        "MEDIUM": "#d97706",
-        "HIGH": "#dc2626",
-        "CRITICAL": "#880000",
-    }.get(level, "#d97706")
+def _score_band(score: int) -> str:
+    for threshold, band, _color in SCORE_BANDS:
+        if score >= threshold:
+            return band
+    return SCORE_FLOOR[0]
 
 
 # ---------------------------------------------------------------------------
@@ -135,6 +281,12 @@ LOGO_SVG = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 480 120" widt
   </g>
 </svg>"""
 
+# The logo appears on the cover and in the signature block. As an <img> with
+# a data URI it is parsed once and then served from the shared image cache,
+# instead of two inline <svg> trees re-parsed on every report.
+LOGO_DATA_URI = "data:image/svg+xml;base64," + base64.b64encode(LOGO_SVG.encode("utf-8")).decode("ascii")
+LOGO_IMG = f'<img src="{LOGO_DATA_URI}" width="320" height="80" alt="Israeli Accessibility Scanner">'
+
 
 # ---------------------------------------------------------------------------
 # Section builders (return HTML strings)
@@ -144,14 +296,16 @@ def _build_cover_html(results: Dict) -> str:
     score = int(results.get("score", 0))
     risk = results.get("risk", {})
     level = risk.get("level", "MEDIUM")
-    risk_data = RISK_COPY.get(level, RISK_COPY["MEDIUM"])
+    risk_data = RISK_COPY_HTML.get(level, RISK_COPY_HTML["MEDIUM"])
+    risk_class = level if level in RISK_COLORS else "MEDIUM"
 
+    estimated_fine = risk.get("estimated_fine")
     fine_html = ""
-    if risk.get("estimated_fine"):
-        fine_html = f'<p class="fine-note"><strong>טווח קנסות משוער:</strong> {_esc(risk["estimated_fine"])}</p>'
+    if estimated_fine:
+        fine_html = f'<p class="fine-note"><strong>טווח קנסות משוער:</strong> {_esc(estimated_fine)}</p>'
 
     return f"""
-    <div class="logo-container">{LOGO_SVG}</div>
+    <div class="logo-container">{LOGO_IMG}</div>
 
     <h1 class="title">דו"ח הערכת סיכון נגישות</h1>
 
@@ -162,7 +316,7 @@ def _build_cover_html(results: Dict) -> str:
       <tr><td class="meta-label">תקן:</td><td>WCAG 2.2 AA / תקן ישראלי 5568</td></tr>
     </table>
 
-    <div class="score-box" style="color: {_score_color(score)};">
+    <div class="score-box score-{_score_band(score)}">
       ציון נגישות: {score} / 100
     </div>
     <p class="score-note">
@@ -170,51 +324,29 @@ def _build_cover_html(results: Dict) -> str:
       ציון נמוך מצביע על בעיות נגישות משמעותיות הדורשות טיפול.
     </p>
 
-    <div class="risk-box" style="border-color: {_risk_color(level)}; color: {_risk_color(level)};">
-      רמת סיכון משפטי: {_esc(risk_data["label"])}
+    <div class="risk-box risk-{risk_class}">
+      רמת סיכון משפטי: {risk_data["label"]}
     </div>
     <p class="risk-note">
       רמת הסיכון המשפטי מוערכת על בסיס מספר הליקויים וחומרתם,
       בהתאם לקריטריונים שנקבעו בחוק הנגישות הישראלי.
     </p>
-    <p class="risk-explanation">{_esc(risk_data["explanation"])}</p>
+    <p class="risk-explanation">{risk_data["explanation"]}</p>
     {fine_html}
     """
 
 
-def _build_legal_overview_html() -> str:
-    return """
-    <div class="page-break"></div>
-    <h2>סקירה משפטית</h2>
-    <p>
-      חוק שוויון זכויות לאנשים עם מוגבלות (תיקון מס' 15) מחייב כל גוף
-      להנגיש את שירותי האינטרנט שלו בהתאם לתקן הישראלי 5568.
-      התקן מבוסס על הנחיות WCAG 2.2 ברמה AA.
-      אי-עמידה בתקן עלולה להוביל לתביעות אזרחיות, קנסות מנהליים
-      ופגיעה במוניטין.
-    </p>
-    <ul class="legal-list">
-      <li>הנגשת האתר לפי WCAG 2.2 AA.</li>
-      <li>פרסום הצהרת נגישות באתר.</li>
-      <li>מינוי רכז/ת נגישות.</li>
-      <li>ביצוע סקר נגישות תקופתי.</li>
-    </ul>
-    """
-
-
 def _build_issues_table_html(results: Dict) -> str:
     summary = results.get("summary", {})
-    rows = [
-        ("קריטי", summary.get("critical", 0), SEVERITY_COLORS["critical"]),
-        ("חמור", summary.get("serious", 0), SEVERITY_COLORS["serious"]),
-        ("בינוני", summary.get("moderate", 0), SEVERITY_COLORS["moderate"]),
-        ("קל", summary.get("minor", 0), SEVERITY_COLORS["minor"]),
-    ]
     total = summary.get("total", 0)
+    if not total:
+        # Clean scan: a table of zeros adds a layout pass and says nothing the
+        # findings section's "no issues found" line doesn't
+        return ""
 
-    rows_html = ""
-    for label, count, color in rows:
-        rows_html += f'<tr><td>{label}</td><td style="color:{color};font-weight:bold;">{count}</td></tr>\n'
+    rows_html = "".join(
+        f'{prefix}{summary.get(key, 0)}</td></tr>\n' for key, prefix in SUMMARY_ROW_PREFIXES
+    )
 
     return f"""
     <h2>סיכום ממצאים לפי חומרה</h2>
@@ -235,22 +367,26 @@ def _build_detailed_issues_html(results: Dict) -> str:
     all_issues: List[Dict] = []
 
     # axe-core violations
-    for v in issues.get("axe_core", []):
-        nodes = v.get("nodes", [])
+    for v in issues.get("axe_core") or ():
+        nodes = v.get("nodes") or ()
+        severity = v.get("impact", "moderate")
         all_issues.append({
             "title": v.get("description", v.get("id", "Unknown")),
-            "severity": v.get("impact", "moderate"),
-            "wcag": ", ".join(t for t in v.get("tags", []) if t.startswith("wcag")),
+            "severity": severity,
+            "rank": SEVERITY_ORDER.get(severity, 9),
+            "wcag": ", ".join(t for t in (v.get("tags") or ()) if t.startswith("wcag")),
             "nodes_count": len(nodes),
             "help": v.get("help", ""),
             "help_url": v.get("helpUrl", ""),
         })
 
     # Playwright checks
-    for c in issues.get("playwright", []):
+    for c in issues.get("playwright") or ():
+        severity = c.get("severity", "moderate")
         all_issues.append({
             "title": c.get("title_he", c.get("rule", "")),
-            "severity": c.get("severity", "moderate"),
+            "severity": severity,
+            "rank": SEVERITY_ORDER.get(severity, 9),
             "wcag": c.get("wcag", ""),
             "nodes_count": 1,
             "help": c.get("description_he", ""),
@@ -258,136 +394,108 @@ def _build_detailed_issues_html(results: Dict) -> str:
         })
 
     if not all_issues:
+        # A one-line note flows on after the summary table instead of
+        # forcing a near-empty page of its own
         return """
-        <div class="page-break"></div>
         <h2>פירוט ממצאים</h2>
         <p>לא נמצאו ליקויים בסריקה האוטומטית.</p>
         """
 
-    # Sort: critical first
-    severity_order = {"critical": 0, "serious": 1, "moderate": 2, "minor": 3}
-    all_issues.sort(key=lambda x: severity_order.get(x["severity"], 9))
+    # Sort: critical first (rank computed while building, so the key is C-level)
+    all_issues.sort(key=itemgetter("rank"))
 
-    issues_html = '<div class="page-break"></div>\n<h2>פירוט ממצאים</h2>\n'
+    # Every fragment goes into one flat list joined once at the end, instead
+    # of per-issue strings re-copied into an ever-growing section string
+    parts = ['<div class="page-break"></div>\n<h2>פירוט ממצאים</h2>\n']
+    append = parts.append
 
     for i, issue in enumerate(all_issues, 1):
         sev = issue["severity"]
-        sev_label = SEVERITY_LABELS.get(sev, sev)
-        sev_color = SEVERITY_COLORS.get(sev, "#6b7280")
+        markup = SEVERITY_MARKUP.get(sev)
+        if markup is None:
+            # Unknown impact: grey styling, raw value as the badge text
+            markup = (SEVERITY_MARKUP["minor"][0], f'<span class="severity-badge">{_esc(sev)}</span>')
+        issue_open, badge = markup
 
-        issue_html = f'<div class="issue" style="border-right-color: {sev_color};">\n'
-        issue_html += f'  <h3>{i}. {_esc(issue["title"])} '
-        issue_html += f'<span class="severity-badge" style="background:{sev_color};">{sev_label}</span></h3>\n'
+        append(issue_open)
+        append(f'  <h3>{i}. {_esc(issue["title"])} {badge}</h3>\n')
 
-        if issue.get("help"):
-            issue_html += f'  <p>{_esc(issue["help"])}</p>\n'
+        help_text = issue.get("help")
+        if help_text:
+            append(f'  <p>{_esc(help_text)}</p>\n')
 
-        if issue.get("wcag"):
-            issue_html += f'  <p class="wcag-ref">WCAG: {_esc(issue["wcag"])}</p>\n'
+        wcag = issue.get("wcag")
+        if wcag:
+            append(f'  <p class="wcag-ref">WCAG: {_esc(wcag)}</p>\n')
 
-        fix = issue.get("fix", {})
+        fix = issue.get("fix")
         if fix:
-            if fix.get("summary_he"):
-                issue_html += f'  <p><strong>כיצד לתקן:</strong> {_esc(fix["summary_he"])}</p>\n'
-            if fix.get("impact"):
-                issue_html += f'  <p><strong>השפעה:</strong> {_esc(fix["impact"])}</p>\n'
-            if fix.get("code_example"):
-                code = _esc(fix["code_example"].strip())
-                issue_html += f'  <pre><code>{code}</code></pre>\n'
-
-        issue_html += '</div>\n'
-        issues_html += issue_html
-
-    return issues_html
+            summary_he = fix.get("summary_he")
+            impact = fix.get("impact")
+            code_example = fix.get("code_example")
+            # Fix and impact share one paragraph — one block box to lay out
+            # per issue instead of two
+            if summary_he and impact:
+                append(
+                    f'  <p><strong>כיצד לתקן:</strong> {_esc(summary_he)}'
+                    f'<br><strong>השפעה:</strong> {_esc(impact)}</p>\n'
+                )
+            elif summary_he:
+                append(f'  <p><strong>כיצד לתקן:</strong> {_esc(summary_he)}</p>\n')
+            elif impact:
+                append(f'  <p><strong>השפעה:</strong> {_esc(impact)}</p>\n')
+            if code_example:
+                code = _esc(code_example.strip())
+                append(f'  <pre><code>{code}</code></pre>\n')
+
+        append('</div>\n')
+
+    return "".join(parts)
 
 
 def _build_standards_checklist_html(results: Dict) -> str:
     coverage = results.get("coverage", {})
-    checked_keys = coverage.get("checked_keys", [])
-    auto_pct = int(coverage.get("automated_estimate", 0.77) * 100)
-
-    checked_items = ""
-    for key in checked_keys:
-        label = CHECKED_KEYS_MAP.get(key, key)
-        checked_items += f"<li>✔ {_esc(label)}</li>\n"
-
-    manual_items_list = [
-        "איכות תיאורים חלופיים",
-        "כתוביות לוידאו",
-        "חווית קורא מסך",
-        "בהירות תוכן וקישורים",
-    ]
-    manual_html = ""
-    for item in manual_items_list:
-        manual_html += f"<li>✖ {item}</li>\n"
+    checked_keys = coverage.get("checked_keys") or ()
+    if coverage.get("mode") == "subset":
+        coverage_html = SUBSET_NOTICE_HTML
+    else:
+        auto_pct = int(coverage.get("automated_estimate", 0.77) * 100)
+        coverage_html = f"<p><strong>כיסוי אוטומטי כולל: {auto_pct}%</strong></p>"
+
+    label_for = CHECKED_KEYS_HTML.get  # bound once, not looked up per item
+    checked_items = "".join(
+        f"<li>✔ {label_for(key) or _esc(key)}</li>\n" for key in checked_keys
+    )
 
     return f"""
     <h2>עמידה בתקן – רשימת בדיקות</h2>
-    <p><strong>כיסוי אוטומטי כולל: {auto_pct}%</strong></p>
+    {coverage_html}
 
     <p><strong>נבדק אוטומטית:</strong></p>
     <ul class="checklist">{checked_items}</ul>
 
     <p><strong>דורש בדיקה ידנית:</strong></p>
-    <ul class="checklist">{manual_html}</ul>
+    <ul class="checklist">{MANUAL_CHECKS_HTML}</ul>
     """
 
 
 def _build_recommendations_html(results: Dict) -> str:
-    risk = results.get("risk", {})
-    level = risk.get("level", "MEDIUM")
-
-    recs = {
-        "CRITICAL": [
-            "פנה מיידית לבודק נגישות מוסמך לבדיקה מקיפה.",
-            "טפל בליקויים הקריטיים בהקדם האפשרי.",
-            "שקול התייעצות משפטית בנושא חשיפה לתביעות.",
-            "הכן תוכנית תיקון עם לוחות זמנים ברורים.",
-        ],
-        "HIGH": [
-            "טפל בליקויים הקריטיים והחמורים בהקדם.",
-            "בצע בדיקה ידנית מקצועית.",
-            "הכן תוכנית תיקון עם לוחות זמנים.",
-            "שקול הכשרת צוות בנושאי נגישות.",
-        ],
-        "MEDIUM": [
-            "טפל בליקויים שנמצאו כדי להפחית חשיפה.",
-            "בצע בדיקה ידנית להשלמת הכיסוי.",
-            "שלב בדיקות נגישות בתהליך הפיתוח.",
-        ],
-        "LOW": [
-            "המשך לתחזק את רמת הנגישות הקיימת.",
-            "בצע בדיקות תקופתיות.",
-            "שלב בדיקות נגישות אוטומטיות ב-CI/CD.",
-        ],
-    }
-
-    items = ""
-    for i, step in enumerate(recs.get(level, recs["MEDIUM"]), 1):
-        items += f"<li>{step}</li>\n"
-
-    return f"""
-    <h2>המלצות לצעדים הבאים</h2>
-    <ol class="recommendations-list">{items}</ol>
-    """
+    level = results.get("risk", {}).get("level", "MEDIUM")
+    return RECOMMENDATIONS_HTML.get(level, RECOMMENDATIONS_HTML["MEDIUM"])
 
 
-def _build_resources_html() -> str:
-    return """
-    <div class="resources-section">
-      <h2>מקורות מידע נוספים</h2>
-      <p class="resources-links">
-        <a href="https://www.w3.org/WAI/WCAG22/quickref/">WCAG 2.2 Guidelines</a> |
-        <a href="https://www.nevo.co.il/law_html/law01/999_969.htm">חוק הנגישות הישראלי</a> |
-        <a href="https://www.gov.il/he/departments/topics/accessibility">נגישות – אתר ממשלתי</a>
-      </p>
-    </div>
-    """
+# (date, markup) of the last disclaimer rendered — it only changes at midnight
+_disclaimer_cache: tuple = (None, "")
 
 
 def _build_disclaimer_html() -> str:
-    today = datetime.now().strftime("%d/%m/%Y")
-    return f"""
+    global _disclaimer_cache
+    d = date.today()
+    if _disclaimer_cache[0] == d:
+        return _disclaimer_cache[1]
+
+    today = f"{d.day:02d}/{d.month:02d}/{d.year}"
+    disclaimer_html = f"""
     <div class="disclaimer">
       <p>
         <strong>הצהרת אחריות:</strong><br>
@@ -403,9 +511,11 @@ def _build_disclaimer_html() -> str:
         דו"ח זה נוצר באופן אוטומטי על ידי Israeli Accessibility Scanner.<br>
         תאריך הפקה: {today}
       </p>
-      <div class="signature-logo">{LOGO_SVG}</div>
+      <div class="signature-logo">{LOGO_IMG}</div>
     </div>
     """
+    _disclaimer_cache = (d, disclaimer_html)
+    return disclaimer_html
 
 
 # ---------------------------------------------------------------------------
@@ -442,7 +552,7 @@ p {
   text-align: center;
   margin-bottom: 20px;
 }
-.logo-container svg {
+.logo-container img {
   display: inline-block;
 }
 
@@ -696,7 +806,7 @@ code, pre {
   opacity: 0.6;
 }
 
-.signature-logo svg {
+.signature-logo img {
   width: 200px;
   height: auto;
 }
@@ -707,43 +817,116 @@ code, pre {
 }
 """
 
+# Severity colours as class rules, so they are parsed once with the stylesheet
+# rather than as an inline style attribute on every issue block and badge
+SEVERITY_CSS = "".join(
+    f".sev-{key} {{ border-right-color: {color}; }}\n"
+    f".sev-{key} .severity-badge {{ background: {color}; }}\n"
+    f".sev-count-{key} {{ color: {color}; font-weight: bold; }}\n"
+    for key, color in SEVERITY_COLORS.items()
+)
+
+# Same for the cover's score and risk boxes
+COVER_CSS = "".join(
+    [f".score-{band} {{ color: {color}; }}\n" for _t, band, color in SCORE_BANDS]
+    + [f".score-{SCORE_FLOOR[0]} {{ color: {SCORE_FLOOR[1]}; }}\n"]
+    + [f".risk-{level} {{ border-color: {color}; color: {color}; }}\n"
+       for level, color in RISK_COLORS.items()]
+)
+
+
+# Decoded images (the logo) keyed by URL, kept for the life of the process
+IMAGE_CACHE: dict = {}
+
+
+@lru_cache(maxsize=None)
+def _renderer():
+    """
+    Import WeasyPrint and build the shared render state on first use.
+
+    WeasyPrint pulls in Pango/cffi at import, which the API process never
+    needs — it only builds HTML and hands rendering to the PDF pool — so
+    the import is deferred to the worker's first (warm-up) render.
+
+    One font configuration per process: without it WeasyPrint builds a fresh
+    fontconfig/Pango font map for every document and re-resolves the Hebrew
+    font stack (DejaVu Sans) on each render. The stylesheet is parsed once
+    and passed to write_pdf, instead of re-parsing an inline <style> block
+    for every report.
+    """
+    from weasyprint import HTML, CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    stylesheet = CSS(string=REPORT_CSS + SEVERITY_CSS + COVER_CSS, font_config=font_config)
+    return HTML, stylesheet, font_config
+
+
+# Document shell wrapped around the section builders
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="he" dir="rtl">
+<head>
+  <meta charset="UTF-8">
+</head>
+<body>"""
+_HTML_TAIL = """</body>
+</html>"""
+
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
-def generate_pdf_report(results: Dict[str, Any]) -> bytes:
+def generate_pdf_report(
+    results: Dict[str, Any],
+    target: Optional[Union[str, BinaryIO]] = None,
+) -> Optional[bytes]:
     """Generate a complete Hebrew PDF accessibility report.
 
-    Returns raw PDF bytes, compatible with the existing route API.
+    Returns raw PDF bytes, compatible with the existing route API. When
+    `target` (a file path or binary file object) is given, the PDF is written
+    there instead and None is returned, so large reports need not be held in
+    memory.
     """
-    sections = [
+    # Document shell and sections joined in one pass — no intermediate
+    # body string re-copied into the page template
+    html_str = "\n".join((
+        _HTML_HEAD,
         _build_cover_html(results),
-        _build_legal_overview_html(),
+        LEGAL_OVERVIEW_HTML,
         _build_issues_table_html(results),
         _build_detailed_issues_html(results),
         _build_standards_checklist_html(results),
         _build_recommendations_html(results),
-        _build_resources_html(),
+        RESOURCES_HTML,
         _build_disclaimer_html(),
-    ]
+        _HTML_TAIL,
+    ))
 
-    body_content = "\n".join(sections)
+    HTML, stylesheet, font_config = _renderer()
 
-    html_str = f"""<!DOCTYPE html>
-<html lang="he" dir="rtl">
-<head>
-  <meta charset="UTF-8">
-  <style>{REPORT_CSS}</style>
-</head>
-<body>
-{body_content}
-</body>
-</html>"""
+    if target is not None:
+        HTML(string=html_str).write_pdf(
+            target, stylesheets=[stylesheet], font_config=font_config, cache=IMAGE_CACHE
+        )
+        logger.info("Generated PDF report to target")
+        return None
 
-    buf = BytesIO()
-    HTML(string=html_str).write_pdf(buf)
-    pdf_bytes = buf.getvalue()
-    buf.close()
+    # With no target, write_pdf returns the bytes itself — no BytesIO round-trip
+    pdf_bytes = HTML(string=html_str).write_pdf(
+        stylesheets=[stylesheet], font_config=font_config, cache=IMAGE_CACHE
+    )
 
     logger.info(f"Generated PDF report ({len(pdf_bytes)} bytes)")
     return pdf_bytes
+
+
+def init_pdf_worker() -> None:
+    """Process-pool initializer: set up logging in the fresh worker, then
+    render a throwaway report so fonts, Pango and the parsed stylesheet are
+    loaded before the first real request."""
+    # Forkserver workers start with an unconfigured root logger
+    logging.basicConfig(level=logging.INFO)
+    try:
+        generate_pdf_report({})
+    except Exception as e:
+        logger.warning(f"PDF worker warm-up failed: {e}")
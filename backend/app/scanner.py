@@ -3,15 +3,80 @@ Core scanner module
 Combines axe-core + Playwright checks for maximum coverage
 """
 
-from playwright.async_api import async_playwright, Page
-from typing import Dict, List, Any, Optional
-import json
-import uuid
+from playwright.async_api import Page, Route, TimeoutError as PlaywrightTimeoutError
+from typing import Dict, List, Any, Mapping, Optional, Tuple
+from collections import Counter
+import asyncio
+import hashlib
+import math
+import os
+import secrets
+import time
 from datetime import datetime
+from pathlib import Path
 import logging
+import re
+from urllib.parse import urlsplit
+
+import orjson
+from cachetools import LRUCache
+
+from .browser_pool import BrowserPool
 
 logger = logging.getLogger(__name__)
 
+# Chromium flags for the shared scan browser: scans only read the DOM, so
+# skip GPU, extensions and background services (/dev/shm is tiny in containers)
+BROWSER_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-default-apps",
+    "--disable-features=TranslateUI,BackForwardCache",
+    "--mute-audio",
+    "--hide-scrollbars",
+    "--blink-settings=imagesEnabled=false",
+    "--no-first-run",
+]
+
+# One long-lived browser for every scan; started by the app's startup hook
+browser_pool = BrowserPool(launch_args=BROWSER_ARGS)
+
+# Resource types neither axe nor the DOM probes need; skipped to cut load time
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+# Analytics/ad/tracking endpoints: extra requests, no accessibility signal
+BLOCKED_URL_RE = re.compile(
+    r"googletagmanager\.com|google-analytics\.com|doubleclick\.net|"
+    r"connect\.facebook\.net|facebook\.com/tr[/?]|hotjar\.com|"
+    r"cdn\.segment\.com|api\.segment\.io|mixpanel\.com"
+)
+
+# axe-core 4.11.0, committed with the app. Read at import so a missing copy
+# stops startup instead of scans quietly pulling third-party JS from a CDN
+AXE_PATH = Path(__file__).parent / "vendor" / "axe.min.js"
+AXE_SOURCE = AXE_PATH.read_text(encoding="utf-8")
+# Registered on each scan context rather than injected as a <script>: init
+# scripts run outside the page's CSP, so a strict script-src can't block axe.
+# Top frame only, as the old injection was, so axe.run doesn't also wait on
+# and audit every third-party iframe
+AXE_INIT_JS = "if (window === window.top) {\n" + AXE_SOURCE + "\n}"
+# Every report (and so every paid PDF) comes from the full WCAG sweep, never
+# the fast rule subset scanner_subprocess can run; coverage.mode says so
+AXE_WCAG_TAGS = {"type": "tag", "values": ["wcag2a", "wcag2aa", "wcag21a", "wcag21aa", "wcag22aa"]}
+
+# Reports keyed by (url, standard, locale, hash of the loaded HTML), so
+# re-scanning an unchanged page skips axe and the Playwright checks. Stored
+# as orjson bytes: every hit decodes its own copy, so callers can't mutate
+# the cached report through nested dicts and lists
+_REPORT_CACHE: LRUCache = LRUCache(maxsize=int(os.getenv("SCAN_CONTENT_CACHE_SIZE", "256")))
+
+# Last scan wall time per host, so batches can start the slowest sites first
+_SCAN_SECONDS: LRUCache = LRUCache(maxsize=1024)
+
 
 async def scan_url(url: str, standard: str = "IL_5568", locale: str = "he") -> Dict[str, Any]:
     """
@@ -30,93 +95,168 @@ async def scan_url(url: str, standard: str = "IL_5568", locale: str = "he") -> D
     Returns:
         Complete accessibility report
     """
-    scan_id = f"scan_{uuid.uuid4().hex[:12]}"
-    
-    async with async_playwright() as p:
-        # Launch browser
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        try:
-            # Navigate to URL
-            logger.info(f"Navigating to {url}")
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Layer 1: Run axe-core
-            logger.info("Running axe-core scan")
-            axe_results = await run_axe_core(page)
-            
-            # Layer 2: Run Playwright checks
-            logger.info("Running Playwright checks")
-            playwright_results = await run_playwright_checks(page)
-            
-            # Calculate overall score
-            score = calculate_score(axe_results, playwright_results)
-            
-            # Assess legal risk (Israeli law)
-            legal_risk = assess_legal_risk(axe_results, playwright_results, standard)
-            
-            # Issue counts
-            critical = count_by_severity(axe_results, playwright_results, "critical")
-            serious = count_by_severity(axe_results, playwright_results, "serious")
-            moderate = count_by_severity(axe_results, playwright_results, "moderate")
-            minor = count_by_severity(axe_results, playwright_results, "minor")
-            total = critical + serious + moderate + minor
-
-            # Combine results
-            report = {
-                "scan_id": scan_id,
-                "url": url,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "score": score,
-                "standard": standard,
-                "locale": locale,
-
-                "coverage": {
-                    "automated_estimate": 0.77,
-                    "automated_total": "77%",
-                    "axe_core": "57%",
-                    "playwright_checks": "20%",
-                    "manual_required": "23%",
-                    "checked_keys": [
-                        "ALT_MISSING", "COLOR_CONTRAST", "ARIA",
-                        "FORM_LABELS", "KEYBOARD_ACCESS", "FOCUS_VISIBLE"
-                    ]
-                },
-
-                "summary": {
-                    "total": total,
-                    "critical": critical,
-                    "serious": serious,
-                    "moderate": moderate,
-                    "minor": minor
-                },
-
-                "issues": {
-                    "axe_core": axe_results.get("violations", []),
-                    "playwright": playwright_results
-                },
-
-                "risk": {
-                    "level": legal_risk["level"].upper(),
-                    "level_he": legal_risk["level_he"],
-                    "explanation_key": f"RISK_{legal_risk['level'].upper()}",
-                    "estimated_fine": legal_risk["estimated_fine"],
-                    "recommendation_he": legal_risk["recommendation_he"],
-                    "critical_issues": legal_risk["critical_issues"],
-                    "serious_issues": legal_risk["serious_issues"],
-                    "law_reference": legal_risk["law_reference"]
-                },
-
-                "what_we_checked": get_coverage_info(locale),
-
-                "next_steps": get_next_steps(score, locale)
-            }
-            
-            return report
-            
-        finally:
-            await browser.close()
+    started = time.monotonic()
+    
+    # Fresh context per scan on the shared, already-running browser
+    async with browser_pool.acquire() as context:
+        await context.route("**/*", _route_request)
+        await context.add_init_script(script=AXE_INIT_JS)
+        page = await context.new_page()
+        report = await _scan_page(page, url, standard, locale)
+    
+    _SCAN_SECONDS[urlsplit(url).netloc] = time.monotonic() - started
+    return report
+
+
+async def scan_urls(
+    urls: List[str],
+    standard: str = "IL_5568",
+    locale: str = "he",
+    concurrency: Optional[int] = None,
+) -> List[Any]:
+    """
+    Scan several URLs concurrently on the shared Chromium instance
+    
+    Each URL gets its own browser context (isolated cookies/storage).
+    URLs are started longest-expected-first (by the host's last scan time,
+    unknown hosts first) so one slow site doesn't start last and hold up
+    the whole batch.
+    
+    Returns:
+        One entry per URL, in order: the report dict, or the exception
+        that scan raised
+    """
+    semaphore = asyncio.Semaphore(concurrency or (os.cpu_count() or 1) * 2)
+    
+    async def scan_one(url: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await scan_url(url, standard, locale)
+    
+    order = sorted(
+        range(len(urls)),
+        key=lambda i: -_SCAN_SECONDS.get(urlsplit(urls[i]).netloc, math.inf),
+    )
+    # gather starts the tasks in argument order, so they queue on the
+    # semaphore in that order too
+    results = await asyncio.gather(
+        *(scan_one(urls[i]) for i in order), return_exceptions=True
+    )
+    
+    ordered: List[Any] = [None] * len(urls)
+    for i, result in zip(order, results):
+        ordered[i] = result
+    return ordered
+
+
+async def _route_request(route: Route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or BLOCKED_URL_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _scan_page(page: Page, url: str, standard: str, locale: str) -> Dict[str, Any]:
+    """Navigate an open page to `url` and build the full report"""
+    scan_id = f"scan_{secrets.token_hex(6)}"  # 48 random bits, without building a UUID
+    
+    # Navigate to URL. Pages with analytics beacons never reach networkidle,
+    # so wait for the DOM, then give the load event a short grace period.
+    logger.info(f"Navigating to {url}")
+    await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+    try:
+        await page.wait_for_load_state("load", timeout=5000)
+    except PlaywrightTimeoutError:
+        logger.info(f"{url} still loading after 5s, scanning current DOM")
+    
+    content_hash = hashlib.blake2b(
+        (await page.content()).encode("utf-8"), digest_size=16
+    ).digest()
+    cache_key = (url, standard, locale, content_hash)
+    cached = _REPORT_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info(f"Page content unchanged since last scan of {url}, reusing results")
+        return {
+            **orjson.loads(cached),
+            "scan_id": scan_id,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        }
+    
+    # Layer 1: Run axe-core
+    logger.info("Running axe-core scan")
+    axe_results = await run_axe_core(page)
+    violations = axe_results.get("violations") or []
+    
+    # Layer 2: Run Playwright checks
+    logger.info("Running Playwright checks")
+    playwright_results = await run_playwright_checks(page)
+    
+    # Calculate overall score and issue counts
+    score, counts = summarize_issues(violations, playwright_results)
+    
+    # Assess legal risk (Israeli law)
+    legal_risk = assess_legal_risk(counts, standard)
+    
+    # Issue counts
+    critical = counts["critical"]
+    serious = counts["serious"]
+    moderate = counts["moderate"]
+    minor = counts["minor"]
+    total = critical + serious + moderate + minor
+
+    # Combine results
+    report = {
+        "scan_id": scan_id,
+        "url": url,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "score": score,
+        "standard": standard,
+        "locale": locale,
+
+        "coverage": {
+            "automated_estimate": 0.77,
+            "automated_total": "77%",
+            "axe_core": "57%",
+            "playwright_checks": "20%",
+            "manual_required": "23%",
+            "mode": "full",
+            "checked_keys": [
+                "ALT_MISSING", "COLOR_CONTRAST", "ARIA",
+                "FORM_LABELS", "KEYBOARD_ACCESS", "FOCUS_VISIBLE"
+            ]
+        },
+
+        "summary": {
+            "total": total,
+            "critical": critical,
+            "serious": serious,
+            "moderate": moderate,
+            "minor": minor
+        },
+
+        "issues": {
+            "axe_core": violations,
+            "playwright": playwright_results
+        },
+
+        "risk": {
+            "level": legal_risk["level"].upper(),
+            "level_he": legal_risk["level_he"],
+            "explanation_key": f"RISK_{legal_risk['level'].upper()}",
+            "estimated_fine": legal_risk["estimated_fine"],
+            "recommendation_he": legal_risk["recommendation_he"],
+            "critical_issues": legal_risk["critical_issues"],
+            "serious_issues": legal_risk["serious_issues"],
+            "law_reference": legal_risk["law_reference"]
+        },
+
+        "what_we_checked": get_coverage_info(locale),
+
+        "next_steps": get_next_steps(score, locale)
+    }
+    
+    _REPORT_CACHE[cache_key] = orjson.dumps(report)
+    return report
 
 
 async def run_axe_core(page: Page) -> Dict[str, Any]:
@@ -124,26 +264,160 @@ async def run_axe_core(page: Page) -> Dict[str, Any]:
     Run axe-core accessibility scan
     
     Coverage: ~57% of real-world issues
+    (axe itself is loaded by the context's init script, see AXE_INIT_JS)
     """
-    # Inject axe-core script
-    await page.add_script_tag(url="https://cdnjs.cloudflare.com/ajax/libs/axe-core/4.8.3/axe.min.js")
-    
-    # Run axe
     results = await page.evaluate("""
-        async () => {
-            const results = await axe.run({
-                runOnly: {
-                    type: 'tag',
-                    values: ['wcag2a', 'wcag2aa', 'wcag21a', 'wcag21aa', 'wcag22aa']
-                }
-            });
-            return results;
+        async (runOnly) => {
+            const results = await axe.run({ runOnly });
+            // Only violations are reported; passes/incomplete/inapplicable and
+            // full outerHTML would just be serialized over CDP and dropped
+            return {
+                violations: results.violations.map(v => ({
+                    id: v.id,
+                    impact: v.impact,
+                    description: v.description,
+                    help: v.help,
+                    helpUrl: v.helpUrl,
+                    tags: v.tags,
+                    nodes: v.nodes.map(n => ({
+                        target: n.target,
+                        html: n.html.slice(0, 500),
+                        failureSummary: n.failureSummary
+                    }))
+                }))
+            };
         }
-    """)
+    """, AXE_WCAG_TAGS)
     
     return results
 
 
+# DOM probes behind the custom checks, gathered in a single page.evaluate
+# so the whole Playwright layer costs one CDP round-trip instead of eight
+PLAYWRIGHT_PROBES_JS = """
+    () => {
+        // One walk over the live element collection feeds every probe
+        // instead of a separate querySelectorAll per check
+        const all = document.getElementsByTagName('*');
+        // One case-insensitive regex per probe instead of lower-casing the
+        // text and running a chain of includes() on every anchor. The raw
+        // href attribute avoids resolving a URL string per link.
+        const SKIP_TEXT_RE = /skip|main|דלג|תוכן/i;
+        const STATEMENT_TEXT_RE = /נגישות|accessibility/i;
+        const STATEMENT_HREF_RE = /(^|[/])(accessibility|negishut)/i;
+        const forms = [];
+        let interactiveCount = 0;
+        let focusableCount = 0;
+        // Where a first Tab press would land: lowest positive tabindex,
+        // otherwise the first natural tab stop in document order
+        let firstPositiveStop = null;
+        let firstNaturalStop = null;
+        let hasSkipLink = false;
+        let hasStatementLink = false;
+
+        // offsetParent comes straight from the layout tree, so most elements
+        // never need a CSSStyleDeclaration. It is also null for fixed and
+        // display:contents elements; only those fall back to computed style.
+        const isVisible = el => {
+            if (el.hidden || el.getAttribute('aria-hidden') === 'true') return false;
+            if (el.offsetParent !== null) return true;
+            const style = window.getComputedStyle(el);
+            return style.display !== 'none' && style.visibility !== 'hidden';
+        };
+
+        for (let i = 0; i < all.length; i++) {
+            const el = all[i];
+            const hasTabindex = el.hasAttribute('tabindex');
+            let interactive = hasTabindex;
+            let focusable = hasTabindex && el.getAttribute('tabindex') !== '-1';
+
+            switch (el.tagName) {
+                case 'A': {
+                    interactive = true;
+                    const rawHref = el.getAttribute('href');
+                    focusable = focusable || rawHref !== null;
+
+                    if (hasSkipLink && hasStatementLink) break;
+                    const text = el.textContent;
+
+                    // Skip links
+                    if (!hasSkipLink && rawHref !== null && rawHref.startsWith('#') &&
+                        SKIP_TEXT_RE.test(text)) {
+                        hasSkipLink = true;
+                    }
+
+                    // Accessibility statement link (Hebrew & English variations)
+                    if (!hasStatementLink &&
+                        (STATEMENT_TEXT_RE.test(text) ||
+                         (rawHref !== null && STATEMENT_HREF_RE.test(rawHref)))) {
+                        hasStatementLink = true;
+                    }
+                    break;
+                }
+                case 'BUTTON':
+                case 'INPUT':
+                case 'SELECT':
+                case 'TEXTAREA':
+                    interactive = true;
+                    focusable = focusable || !el.hasAttribute('disabled');
+                    break;
+                case 'FORM':
+                    forms.push(el);
+                    break;
+            }
+
+            // Keyboard navigation
+            if (!interactive) continue;
+            interactiveCount++;
+            if (focusable && isVisible(el)) {
+                focusableCount++;
+
+                const tabIndex = el.tabIndex;
+                if (tabIndex > 0) {
+                    if (!firstPositiveStop || tabIndex < firstPositiveStop.tabIndex) {
+                        firstPositiveStop = el;
+                    }
+                } else if (tabIndex === 0 && !firstNaturalStop) {
+                    firstNaturalStop = el;
+                }
+            }
+        }
+
+        // Focus visible: focus the first tab stop, as a Tab press would
+        const tabStop = firstPositiveStop || firstNaturalStop;
+        if (tabStop) tabStop.focus({ preventScroll: true });
+
+        let hasFocusIndicator = false;
+        const active = document.activeElement;
+        if (active) {
+            const style = window.getComputedStyle(active);
+
+            // Check for outline, border, or box-shadow (numeric, so 0.5px counts)
+            const hasOutline = parseFloat(style.outlineWidth) > 0 && style.outlineStyle !== 'none';
+            const hasBorder = parseFloat(style.borderWidth) > 0 && style.borderStyle !== 'none';
+            const hasBoxShadow = style.boxShadow !== 'none';
+
+            hasFocusIndicator = hasOutline || hasBorder || hasBoxShadow;
+        }
+
+        // Form error handling
+        let formsWithErrors = 0;
+        for (const form of forms) {
+            const hasErrorHandling = form.querySelector('[role="alert"]') ||
+                                    form.querySelector('[aria-describedby]') ||
+                                    form.querySelector('.error') ||
+                                    form.querySelector('[aria-invalid]');
+            if (hasErrorHandling) formsWithErrors++;
+        }
+
+        return {
+            interactiveCount, focusableCount, hasFocusIndicator, hasSkipLink,
+            formsTotal: forms.length, formsWithErrors, hasStatementLink
+        };
+    }
+"""
+
+
 async def run_playwright_checks(page: Page) -> List[Dict[str, Any]]:
     """
     Run custom Playwright accessibility checks
@@ -157,237 +431,128 @@ async def run_playwright_checks(page: Page) -> List[Dict[str, Any]]:
     4. Form errors
     5. Accessibility statement (Israeli Standard 5568)
     """
-    checks = []
-    
-    # Check 1: Keyboard Navigation
-    keyboard_result = await check_keyboard_navigation(page)
-    if keyboard_result:
-        checks.append(keyboard_result)
-    
-    # Check 2: Focus Visible
-    focus_result = await check_focus_visible(page)
-    if focus_result:
-        checks.append(focus_result)
-    
-    # Check 3: Skip Links
-    skip_result = await check_skip_links(page)
-    if skip_result:
-        checks.append(skip_result)
-    
-    # Check 4: Form Errors (if forms exist)
-    form_result = await check_form_errors(page)
-    if form_result:
-        checks.append(form_result)
+    try:
+        probes = await page.evaluate(PLAYWRIGHT_PROBES_JS)
+    except Exception as e:
+        logger.error(f"Playwright checks failed: {e}")
+        return []
     
-    # Check 5: Accessibility Statement (Israeli Standard 5568 requirement)
-    statement_result = await check_accessibility_statement(page)
-    if statement_result:
-        checks.append(statement_result)
+    checks = []
+    for check in (
+        check_keyboard_navigation,
+        check_focus_visible,
+        check_skip_links,
+        check_form_errors,
+        check_accessibility_statement,  # Israeli Standard 5568 requirement
+    ):
+        result = check(probes)
+        if result:
+            checks.append(result)
     
     return checks
 
 
-async def check_keyboard_navigation(page: Page) -> Optional[Dict[str, Any]]:
+def check_keyboard_navigation(probes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Check: Are all interactive elements keyboard accessible?
     WCAG 2.1.1 - Keyboard
     """
-    try:
-        # Get all interactive elements
-        interactive_count = await page.evaluate("""
-            () => {
-                const elements = document.querySelectorAll(
-                    'button, a, input, select, textarea, [tabindex]'
-                );
-                return elements.length;
-            }
-        """)
-        
-        if interactive_count == 0:
-            return None
-        
-        # Try tabbing through
-        focusable_count = await page.evaluate("""
-            () => {
-                let count = 0;
-                const elements = document.querySelectorAll(
-                    'button:not([disabled]), a[href], input:not([disabled]), ' +
-                    'select:not([disabled]), textarea:not([disabled]), ' +
-                    '[tabindex]:not([tabindex="-1"])'
-                );
-                
-                elements.forEach(el => {
-                    // Check if element is visible
-                    const style = window.getComputedStyle(el);
-                    if (style.display !== 'none' && style.visibility !== 'hidden') {
-                        count++;
-                    }
-                });
-                
-                return count;
-            }
-        """)
-        
-        # If mismatch, there's an issue
-        if focusable_count < interactive_count * 0.9:  # Allow 10% margin
-            return {
-                "id": "keyboard-navigation",
-                "rule": "keyboard-accessible",
-                "wcag": "2.1.1",
-                "severity": "critical",
-                "title_he": "אלמנטים לא נגישים במקלדת",
-                "description_he": f"נמצאו {interactive_count - focusable_count} אלמנטים שאינם נגישים דרך מקלדת",
-                "how_to_fix": {
-                    "summary_he": "הסר tabindex=\"-1\" או הוסף tabindex=\"0\" לאלמנטים אינטראקטיביים",
-                    "code_example": '<button tabindex="0">לחץ כאן</button>',
-                    "impact": "משתמשים שמשתמשים רק במקלדת לא יכולים לגשת לאלמנטים אלו"
-                }
-            }
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Keyboard navigation check failed: {e}")
+    interactive_count = probes["interactiveCount"]
+    if interactive_count == 0:
         return None
+    
+    focusable_count = probes["focusableCount"]
+    
+    # If mismatch, there's an issue
+    if focusable_count < interactive_count * 0.9:  # Allow 10% margin
+        return {
+            "id": "keyboard-navigation",
+            "rule": "keyboard-accessible",
+            "wcag": "2.1.1",
+            "severity": "critical",
+            "title_he": "אלמנטים לא נגישים במקלדת",
+            "description_he": f"נמצאו {interactive_count - focusable_count} אלמנטים שאינם נגישים דרך מקלדת",
+            "how_to_fix": {
+                "summary_he": "הסר tabindex=\"-1\" או הוסף tabindex=\"0\" לאלמנטים אינטראקטיביים",
+                "code_example": '<button tabindex="0">לחץ כאן</button>',
+                "impact": "משתמשים שמשתמשים רק במקלדת לא יכולים לגשת לאלמנטים אלו"
+            }
+        }
+    
+    return None
 
 
-async def check_focus_visible(page: Page) -> Optional[Dict[str, Any]]:
+def check_focus_visible(probes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Check: Is there a visible focus indicator?
     WCAG 2.4.7 - Focus Visible
     """
-    try:
-        # Tab once and check focus indicator
-        await page.keyboard.press('Tab')
-        
-        has_focus_indicator = await page.evaluate("""
-            () => {
-                const el = document.activeElement;
-                if (!el) return false;
-                
-                const style = window.getComputedStyle(el);
-                
-                // Check for outline, border, or box-shadow
-                const hasOutline = style.outlineWidth !== '0px' && style.outlineStyle !== 'none';
-                const hasBorder = style.borderWidth !== '0px' && style.borderStyle !== 'none';
-                const hasBoxShadow = style.boxShadow !== 'none';
-                
-                return hasOutline || hasBorder || hasBoxShadow;
-            }
-        """)
-        
-        if not has_focus_indicator:
-            return {
-                "id": "focus-visible",
-                "rule": "focus-visible",
-                "wcag": "2.4.7",
-                "severity": "serious",
-                "title_he": "אינדיקטור פוקוס לא נראה",
-                "description_he": "אלמנטים לא מציגים אינדיקטור ברור כאשר מקבלים פוקוס",
-                "how_to_fix": {
-                    "summary_he": "הוסף outline או border לאלמנטים בעלי :focus",
-                    "code_example": """
+    if not probes["hasFocusIndicator"]:
+        return {
+            "id": "focus-visible",
+            "rule": "focus-visible",
+            "wcag": "2.4.7",
+            "severity": "serious",
+            "title_he": "אינדיקטור פוקוס לא נראה",
+            "description_he": "אלמנטים לא מציגים אינדיקטור ברור כאשר מקבלים פוקוס",
+            "how_to_fix": {
+                "summary_he": "הוסף outline או border לאלמנטים בעלי :focus",
+                "code_example": """
 button:focus {
   outline: 2px solid #0066cc;
   outline-offset: 2px;
 }""",
-                    "impact": "משתמשים לא יודעים איפה הם נמצאים בעת ניווט במקלדת"
-                }
+                "impact": "משתמשים לא יודעים איפה הם נמצאים בעת ניווט במקלדת"
             }
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Focus visible check failed: {e}")
-        return None
+        }
+    
+    return None
 
 
-async def check_skip_links(page: Page) -> Optional[Dict[str, Any]]:
+def check_skip_links(probes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Check: Does page have skip links?
     WCAG 2.4.1 - Bypass Blocks
     """
-    try:
-        has_skip_link = await page.evaluate("""
-            () => {
-                const skipLinks = document.querySelectorAll('a[href^="#"]');
-                for (let link of skipLinks) {
-                    const text = link.textContent.toLowerCase();
-                    if (text.includes('skip') || text.includes('דלג') || 
-                        text.includes('main') || text.includes('תוכן')) {
-                        return true;
-                    }
-                }
-                return false;
-            }
-        """)
-        
-        if not has_skip_link:
-            return {
-                "id": "skip-links",
-                "rule": "bypass-blocks",
-                "wcag": "2.4.1",
-                "severity": "moderate",
-                "title_he": "חסר קישור דילוג לתוכן",
-                "description_he": "הדף לא כולל קישור לדילוג ישירות לתוכן הראשי",
-                "how_to_fix": {
-                    "summary_he": "הוסף קישור 'דלג לתוכן ראשי' בתחילת הדף",
-                    "code_example": '<a href="#main-content" class="skip-link">דלג לתוכן ראשי</a>',
-                    "impact": "משתמשי מקלדת צריכים לעבור דרך כל הניווט בכל עמוד"
-                }
+    if not probes["hasSkipLink"]:
+        return {
+            "id": "skip-links",
+            "rule": "bypass-blocks",
+            "wcag": "2.4.1",
+            "severity": "moderate",
+            "title_he": "חסר קישור דילוג לתוכן",
+            "description_he": "הדף לא כולל קישור לדילוג ישירות לתוכן הראשי",
+            "how_to_fix": {
+                "summary_he": "הוסף קישור 'דלג לתוכן ראשי' בתחילת הדף",
+                "code_example": '<a href="#main-content" class="skip-link">דלג לתוכן ראשי</a>',
+                "impact": "משתמשי מקלדת צריכים לעבור דרך כל הניווט בכל עמוד"
             }
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Skip links check failed: {e}")
-        return None
+        }
+    
+    return None
 
 
-async def check_form_errors(page: Page) -> Optional[Dict[str, Any]]:
+def check_form_errors(probes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Check: Are form errors properly displayed?
     WCAG 3.3.1 - Error Identification
     """
-    try:
-        # Check if page has forms
-        has_forms = await page.evaluate("""
-            () => document.querySelectorAll('form').length > 0
-        """)
-        
-        if not has_forms:
-            return None
-        
-        # This is a basic check - full test requires interaction
-        # For MVP, we just check if forms have aria-describedby or role="alert"
-        forms_with_error_handling = await page.evaluate("""
-            () => {
-                const forms = document.querySelectorAll('form');
-                let count = 0;
-                
-                forms.forEach(form => {
-                    const hasErrorHandling = form.querySelector('[role="alert"]') ||
-                                            form.querySelector('[aria-describedby]') ||
-                                            form.querySelector('.error') ||
-                                            form.querySelector('[aria-invalid]');
-                    if (hasErrorHandling) count++;
-                });
-                
-                return { total: forms.length, withErrors: count };
-            }
-        """)
-        
-        if forms_with_error_handling['withErrors'] == 0:
-            return {
-                "id": "form-errors",
-                "rule": "error-identification",
-                "wcag": "3.3.1",
-                "severity": "serious",
-                "title_he": "טפסים ללא טיפול בשגיאות",
-                "description_he": f"נמצאו {forms_with_error_handling['total']} טפסים ללא מנגנון הצגת שגיאות",
-                "how_to_fix": {
-                    "summary_he": "הוסף role='alert' או aria-describedby לשדות עם שגיאות",
-                    "code_example": """
+    if probes["formsTotal"] == 0:
+        return None
+    
+    # This is a basic check - full test requires interaction
+    # For MVP, we just check if forms have aria-describedby or role="alert"
+    if probes["formsWithErrors"] == 0:
+        return {
+            "id": "form-errors",
+            "rule": "error-identification",
+            "wcag": "3.3.1",
+            "severity": "serious",
+            "title_he": "טפסים ללא טיפול בשגיאות",
+            "description_he": f"נמצאו {probes['formsTotal']} טפסים ללא מנגנון הצגת שגיאות",
+            "how_to_fix": {
+                "summary_he": "הוסף role='alert' או aria-describedby לשדות עם שגיאות",
+                "code_example": """
 <input 
   type="email" 
   aria-describedby="email-error" 
@@ -396,18 +561,14 @@ async def check_form_errors(page: Page) -> Optional[Dict[str, Any]]:
 <span id="email-error" role="alert">
   כתובת דוא"ל לא תקינה
 </span>""",
-                    "impact": "משתמשים לא יידעו על שגיאות בטופס"
-                }
+                "impact": "משתמשים לא יידעו על שגיאות בטופס"
             }
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Form errors check failed: {e}")
-        return None
+        }
+    
+    return None
 
 
-async def check_accessibility_statement(page: Page) -> Optional[Dict[str, Any]]:
+def check_accessibility_statement(probes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
     Check: Does the site have an accessibility statement?
     Israeli Standard 5568 - Legal Requirement
@@ -416,40 +577,17 @@ async def check_accessibility_statement(page: Page) -> Optional[Dict[str, Any]]:
     1. קישור להצהרת נגישות
     2. פרטי רכז נגישות (שם, אימייל, טלפון)
     """
-    try:
-        # Check for accessibility statement link
-        has_statement_link = await page.evaluate("""
-            () => {
-                const links = document.querySelectorAll('a');
-                for (let link of links) {
-                    const text = link.textContent.toLowerCase();
-                    const href = (link.href || '').toLowerCase();
-                    
-                    // Hebrew & English variations
-                    if (text.includes('נגישות') || 
-                        text.includes('accessibility') ||
-                        text.includes('הצהרת נגישות') ||
-                        href.includes('/accessibility') ||
-                        href.includes('/negishut') ||
-                        href.includes('/accessibility-statement')) {
-                        return true;
-                    }
-                }
-                return false;
-            }
-        """)
-        
-        if not has_statement_link:
-            return {
-                "id": "accessibility-statement",
-                "rule": "israeli-standard-5568",
-                "wcag": "N/A (Israeli Law)",
-                "severity": "serious",
-                "title_he": "חסרה הצהרת נגישות",
-                "description_he": "לא נמצא קישור להצהרת נגישות. זוהי חובה משפטית לפי תקן ישראלי 5568",
-                "how_to_fix": {
-                    "summary_he": "צור עמוד הצהרת נגישות והוסף קישור אליו בפוטר",
-                    "code_example": """
+    if not probes["hasStatementLink"]:
+        return {
+            "id": "accessibility-statement",
+            "rule": "israeli-standard-5568",
+            "wcag": "N/A (Israeli Law)",
+            "severity": "serious",
+            "title_he": "חסרה הצהרת נגישות",
+            "description_he": "לא נמצא קישור להצהרת נגישות. זוהי חובה משפטית לפי תקן ישראלי 5568",
+            "how_to_fix": {
+                "summary_he": "צור עמוד הצהרת נגישות והוסף קישור אליו בפוטר",
+                "code_example": """
 <!-- בפוטר של האתר -->
 <footer>
   <nav aria-label="קישורי תחתית">
@@ -478,80 +616,54 @@ async def check_accessibility_statement(page: Page) -> Optional[Dict[str, Any]]:
   <h2>תלונות והערות</h2>
   <p>אם נתקלת בבעיית נגישות, אנא פנה אלינו.</p>
 </main>""",
-                    "impact": "חובה חוקית - ללא הצהרת נגישות האתר לא עומד בתקן 5568"
-                }
+                "impact": "חובה חוקית - ללא הצהרת נגישות האתר לא עומד בתקן 5568"
             }
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Accessibility statement check failed: {e}")
-        return None
+        }
+    
+    return None
+
+
+# Score deduction per issue severity
+AXE_SEVERITY_WEIGHTS = {"critical": 10, "serious": 5, "moderate": 2, "minor": 1}
+PLAYWRIGHT_SEVERITY_WEIGHTS = {"critical": 15, "serious": 10, "moderate": 5, "minor": 2}
 
 
-def calculate_score(axe_results: Dict, playwright_results: List) -> int:
+def summarize_issues(violations: List[Dict], playwright_results: List) -> Tuple[int, Counter]:
     """
-    Calculate overall accessibility score (0-100)
+    Calculate overall accessibility score (0-100) and issue counts by severity
     
     Formula:
     - Start with 100
     - Deduct points based on severity and count
+    
+    Counts are per affected node for axe-core violations and per failed
+    check for Playwright checks. Both come out of a single pass.
     """
     score = 100
+    counts: Counter = Counter()
     
-    # Deduct for axe-core violations
-    for violation in axe_results.get("violations", []):
-        impact = violation.get("impact", "moderate")
+    # axe-core violations
+    for violation in violations:
+        impact = violation.get("impact")
         nodes_count = len(violation.get("nodes", []))
-        
-        # Severity weights
-        weights = {
-            "critical": 10,
-            "serious": 5,
-            "moderate": 2,
-            "minor": 1
-        }
-        
-        deduction = weights.get(impact, 2) * min(nodes_count, 5)  # Cap at 5 instances
-        score -= deduction
-    
-    # Deduct for Playwright checks
-    for check in playwright_results:
-        severity = check.get("severity", "moderate")
-        weights = {
-            "critical": 15,
-            "serious": 10,
-            "moderate": 5,
-            "minor": 2
-        }
-        score -= weights.get(severity, 5)
-    
-    return max(0, min(100, score))  # Clamp between 0-100
-
-
-def count_by_severity(axe_results: Dict, playwright_results: List, severity: str) -> int:
-    """Count issues by severity"""
-    count = 0
-    
-    # Count axe violations
-    for violation in axe_results.get("violations", []):
-        if violation.get("impact") == severity:
-            count += len(violation.get("nodes", []))
+        score -= AXE_SEVERITY_WEIGHTS.get(impact, 2) * min(nodes_count, 5)  # Cap at 5 instances
+        counts[impact] += nodes_count
     
-    # Count Playwright checks
+    # Playwright checks
     for check in playwright_results:
-        if check.get("severity") == severity:
-            count += 1
+        severity = check.get("severity")
+        score -= PLAYWRIGHT_SEVERITY_WEIGHTS.get(severity, 5)
+        counts[severity] += 1
     
-    return count
+    return max(0, min(100, score)), counts  # Clamp between 0-100
 
 
-def assess_legal_risk(axe_results: Dict, playwright_results: List, standard: str) -> Dict[str, Any]:
+def assess_legal_risk(counts: Mapping[str, int], standard: str) -> Dict[str, Any]:
     """
     Assess legal risk according to Israeli law
     """
-    critical_count = count_by_severity(axe_results, playwright_results, "critical")
-    serious_count = count_by_severity(axe_results, playwright_results, "serious")
+    critical_count = counts["critical"]
+    serious_count = counts["serious"]
     
     total_severe = critical_count + serious_count
     
@@ -587,99 +699,111 @@ def assess_legal_risk(axe_results: Dict, playwright_results: List, standard: str
     }
 
 
-def get_coverage_info(locale: str) -> Dict[str, List[str]]:
+# What we checked vs what requires manual testing, per locale. Shared by
+# every report, so treat these as read-only.
+COVERAGE_INFO = {
+    "he": {
+        "checked_automatically": (
+            "תמונות ללא alt text (axe-core)",
+            "ניגודיות צבעים (axe-core)",
+            "תגיות ARIA (axe-core)",
+            "טפסים ללא labels (axe-core)",
+            "מבנה כותרות (axe-core)",
+            "ניווט מקלדת (playwright)",
+            "אינדיקטור פוקוס (playwright)",
+            "קישורי דילוג (playwright)",
+            "טיפול בשגיאות בטפסים (playwright)",
+            "הצהרת נגישות (playwright - תקן 5568)"
+        ),
+        "requires_manual": (
+            "איכות תיאורי תמונות",
+            "בהירות טקסט קישורים",
+            "הגיון כותרות",
+            "כתוביות וידאו",
+            "תיאור אודיו",
+            "בדיקת קורא מסך",
+            "בדיקת משתמשים"
+        )
+    },
+    "en": {
+        "checked_automatically": (
+            "Images without alt text (axe-core)",
+            "Color contrast (axe-core)",
+            "ARIA tags (axe-core)",
+            "Forms without labels (axe-core)",
+            "Heading structure (axe-core)",
+            "Keyboard navigation (playwright)",
+            "Focus indicator (playwright)",
+            "Skip links (playwright)",
+            "Form error handling (playwright)",
+            "Accessibility statement (playwright - IL 5568)"
+        ),
+        "requires_manual": (
+            "Alt text quality",
+            "Link text clarity",
+            "Heading logic",
+            "Video captions",
+            "Audio descriptions",
+            "Screen reader testing",
+            "User testing"
+        )
+    }
+}
+
+# Recommended next steps per locale: (score >= 80, score >= 60, below 60)
+NEXT_STEPS = {
+    "he": (
+        (
+            "המשך לשמור על רמת הנגישות הגבוהה",
+            "בצע בדיקה ידנית לכיסוי המלא",
+            "הוסף בדיקות נגישות ל-CI/CD"
+        ),
+        (
+            "טפל בבעיות הקריטיות תחילה",
+            "הוסף alt text לכל התמונות",
+            "תקן ניגודיות צבעים",
+            "בצע בדיקה ידנית"
+        ),
+        (
+            "התייעץ עם מומחה נגישות",
+            "טפל בכל הבעיות הקריטיות מיד",
+            "שקול שירות תיקון מלא",
+            "צור תוכנית נגישות ארגונית"
+        )
+    ),
+    "en": (
+        (
+            "Maintain high accessibility level",
+            "Perform manual testing for full coverage",
+            "Add accessibility checks to CI/CD"
+        ),
+        (
+            "Address critical issues first",
+            "Add alt text to all images",
+            "Fix color contrast",
+            "Perform manual testing"
+        ),
+        (
+            "Consult accessibility expert",
+            "Fix all critical issues immediately",
+            "Consider full remediation service",
+            "Create organizational accessibility plan"
+        )
+    )
+}
+
+
+def get_coverage_info(locale: str) -> Dict[str, Tuple[str, ...]]:
     """Get what we checked vs what requires manual testing"""
-    if locale == "he":
-        return {
-            "checked_automatically": [
-                "תמונות ללא alt text (axe-core)",
-                "ניגודיות צבעים (axe-core)",
-                "תגיות ARIA (axe-core)",
-                "טפסים ללא labels (axe-core)",
-                "מבנה כותרות (axe-core)",
-                "ניווט מקלדת (playwright)",
-                "אינדיקטור פוקוס (playwright)",
-                "קישורי דילוג (playwright)",
-                "טיפול בשגיאות בטפסים (playwright)",
-                "הצהרת נגישות (playwright - תקן 5568)"
-            ],
-            "requires_manual": [
-                "איכות תיאורי תמונות",
-                "בהירות טקסט קישורים",
-                "הגיון כותרות",
-                "כתוביות וידאו",
-                "תיאור אודיו",
-                "בדיקת קורא מסך",
-                "בדיקת משתמשים"
-            ]
-        }
-    else:
-        return {
-            "checked_automatically": [
-                "Images without alt text (axe-core)",
-                "Color contrast (axe-core)",
-                "ARIA tags (axe-core)",
-                "Forms without labels (axe-core)",
-                "Heading structure (axe-core)",
-                "Keyboard navigation (playwright)",
-                "Focus indicator (playwright)",
-                "Skip links (playwright)",
-                "Form error handling (playwright)",
-                "Accessibility statement (playwright - IL 5568)"
-            ],
-            "requires_manual": [
-                "Alt text quality",
-                "Link text clarity",
-                "Heading logic",
-                "Video captions",
-                "Audio descriptions",
-                "Screen reader testing",
-                "User testing"
-            ]
-        }
+    return COVERAGE_INFO["he" if locale == "he" else "en"]
 
 
-def get_next_steps(score: int, locale: str) -> List[str]:
+def get_next_steps(score: int, locale: str) -> Tuple[str, ...]:
     """Get recommended next steps based on score"""
-    if locale == "he":
-        if score >= 80:
-            return [
-                "המשך לשמור על רמת הנגישות הגבוהה",
-                "בצע בדיקה ידנית לכיסוי המלא",
-                "הוסף בדיקות נגישות ל-CI/CD"
-            ]
-        elif score >= 60:
-            return [
-                "טפל בבעיות הקריטיות תחילה",
-                "הוסף alt text לכל התמונות",
-                "תקן ניגודיות צבעים",
-                "בצע בדיקה ידנית"
-            ]
-        else:
-            return [
-                "התייעץ עם מומחה נגישות",
-                "טפל בכל הבעיות הקריטיות מיד",
-                "שקול שירות תיקון מלא",
-                "צור תוכנית נגישות ארגונית"
-            ]
+    high, medium, low = NEXT_STEPS["he" if locale == "he" else "en"]
+    if score >= 80:
+        return high
+    elif score >= 60:
+        return medium
     else:
-        if score >= 80:
-            return [
-                "Maintain high accessibility level",
-                "Perform manual testing for full coverage",
-                "Add accessibility checks to CI/CD"
-            ]
-        elif score >= 60:
-            return [
-                "Address critical issues first",
-                "Add alt text to all images",
-                "Fix color contrast",
-                "Perform manual testing"
-            ]
-        else:
-            return [
-                "Consult accessibility expert",
-                "Fix all critical issues immediately",
-                "Consider full remediation service",
-                "Create organizational accessibility plan"
-            ]
+        return low
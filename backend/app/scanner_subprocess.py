@@ -1,12 +1,24 @@
 """
 Subprocess scanner - runs Playwright in isolation to avoid asyncio issues
 Accessibility Scanner v1.1 - Risk Assessment Product
+
+Usage:
+    python scanner_subprocess.py <url> [standard] [locale]   # one scan, one browser
+    python scanner_subprocess.py --worker                    # JSON lines on stdin/stdout
 """
 
 import sys
-import json
-from playwright.sync_api import sync_playwright
-import uuid
+import hashlib
+import re
+import secrets
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from pathlib import Path
+from typing import BinaryIO, Optional
+import orjson
+import httpx
+from cachetools import LRUCache
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright, Route, Error as PlaywrightError, sync_playwright
 from datetime import datetime
 
 
@@ -16,221 +28,507 @@ RISK_MEDIUM = "MEDIUM"
 RISK_HIGH = "HIGH"
 RISK_CRITICAL = "CRITICAL"
 
+# Score deduction per severity: axe (per node, capped at 5) and DOM checks
+AXE_WEIGHTS = {"critical": 10, "serious": 5, "moderate": 2, "minor": 1}
+CHECK_WEIGHTS = {"critical": 15, "serious": 10, "moderate": 5, "minor": 2}
+
+# Chromium flags: scans only read the DOM, so skip GPU, images, extensions
+# and background services (/dev/shm is tiny in containers)
+LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-default-apps",
+    "--disable-features=TranslateUI,BackForwardCache",
+    "--mute-audio",
+    "--hide-scrollbars",
+    "--blink-settings=imagesEnabled=false",
+    "--no-first-run",
+]
+
+# --worker mode reuses one context (cookies and permissions cleared between
+# scans) and replaces it after this many scans or any failed scan
+CONTEXT_MAX_SCANS = 50
+
+# Pixels aren't audited: axe reads the DOM and computed styles. Stylesheets
+# still load since contrast and the :focus rule check depend on them.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Focus-visible check: cross-origin stylesheets (the ones whose cssRules the
+# page can't read) are fetched in parallel, and the whole check gives up after
+# STYLESHEET_BUDGET_S however many sheets are slow
+STYLESHEET_BUDGET_S = 5.0
+STYLESHEET_FETCHERS = 8
+
+# Sync Playwright objects are bound to their thread, so the parallel fetches
+# go through a (thread-safe) httpx client instead of page.request
+_stylesheet_client = httpx.Client(timeout=STYLESHEET_BUDGET_S, follow_redirects=True)
+_stylesheet_pool = ThreadPoolExecutor(max_workers=STYLESHEET_FETCHERS, thread_name_prefix="stylesheet")
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+# Same committed axe-core copy the async scanner uses, read once per process.
+# No CDN fallback: without the file the scanner fails at import, not per page
+AXE_PATH = Path(__file__).parent / "vendor" / "axe.min.js"
+AXE_SOURCE = AXE_PATH.read_text(encoding="utf-8")
+# Installed per context with SCAN_INIT_JS instead of a per-scan <script> tag,
+# so a strict script-src CSP can't block it; top frame only, like the old tag
+AXE_INIT_JS = "if (window === window.top) {\n" + AXE_SOURCE + "\n}"
+
+# Resolves once the DOM has gone 300ms without mutations (SPAs rendering
+# after load), capped at the 2s the scanner used to sleep unconditionally
+DOM_SETTLED_JS = """
+    () => new Promise(resolve => {
+        let quiet;
+        const done = () => {
+            observer.disconnect();
+            clearTimeout(quiet);
+            clearTimeout(cap);
+            resolve();
+        };
+        const observer = new MutationObserver(() => {
+            clearTimeout(quiet);
+            quiet = setTimeout(done, 300);
+        });
+        observer.observe(document, { childList: true, subtree: true, attributes: true });
+        quiet = setTimeout(done, 300);
+        const cap = setTimeout(done, 2000);
+    })
+"""
+
+# Failure message substring -> error_key, first match wins (else PARTIAL_SCAN)
+ERROR_KEYS = (
+    ("Timeout", "TIMEOUT"),
+    ("net::ERR_BLOCKED", "BLOCKED"),
+    ("403", "BLOCKED"),
+    ("net::ERR", "INVALID_URL"),
+)
+
+# Result lines: timestamps are naive utcnow() datetimes serialized as "...Z"
+DUMPS_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+
+# Results keyed by (url, standard, locale, full_wcag, hash of the loaded HTML); in
+# --worker mode repeated URLs with unchanged pages skip axe and the checks.
+# Stored serialized so each hit decodes its own copy of the nested dicts
+_RESULT_CACHE: LRUCache = LRUCache(maxsize=256)
+
+# axe rules behind the reported checked_keys (ALT_MISSING, COLOR_CONTRAST,
+# ARIA, FORM_LABELS); rule cost scales with DOM size. Opt-in only, with
+# "full_wcag": false, for quick previews: a "subset" score and risk level
+# leave out every other WCAG failure, so results say which set ran in
+# coverage.mode and anything paid or certified must use the full sweep.
+AXE_RULES = {
+    "type": "rule",
+    "values": [
+        "image-alt", "input-image-alt", "role-img-alt",
+        "object-alt", "svg-img-alt", "area-alt",
+        "color-contrast",
+        "aria-allowed-attr", "aria-required-attr", "aria-roles",
+        "aria-valid-attr", "aria-valid-attr-value",
+        "label", "form-field-multiple-labels", "select-name",
+        "button-name", "link-name",
+    ],
+}
+# Full WCAG sweep, the default (same tags as the async scanner)
+AXE_WCAG_TAGS = {"type": "tag", "values": ["wcag2a", "wcag2aa", "wcag21a", "wcag21aa", "wcag22aa"]}
+
+# Only violations are needed, reduced in-page to impact and node count so
+# passes/incomplete and per-node html never cross the CDP pipe
+AXE_RUN_JS = """
+    async (runOnly) => {
+        const results = await axe.run({ runOnly, resultTypes: ['violations'] });
+        return {
+            violations: results.violations.map(v => ({ id: v.id, impact: v.impact, count: v.nodes.length }))
+        };
+    }
+"""
+
+# DOM probes for the Playwright checks, returned from one page.evaluate
+# instead of five separate round-trips
+CHECKS_JS = """
+    () => {
+        // Keyboard navigation (keyboard reachability). One query; the
+        // focusable subset (button:not([disabled]), a[href], ...,
+        // [tabindex]:not([tabindex="-1"])) is filtered in JS. The same
+        // pass counts required form fields with no error association
+        const all = document.querySelectorAll('button, a, input, select, textarea, [tabindex]');
+        const interactive = all.length;
+
+        let focusable = 0;
+        let formIssues = 0;
+        for (const el of all) {
+            const tabindex = el.getAttribute('tabindex');
+            let reachable = tabindex !== null && tabindex !== '-1';
+            switch (el.localName) {
+                case 'a':
+                    reachable = reachable || el.hasAttribute('href');
+                    break;
+                case 'input':
+                case 'select':
+                case 'textarea':
+                    if (el.required && el.form &&
+                        !el.hasAttribute('aria-describedby') && !el.hasAttribute('aria-errormessage')) {
+                        formIssues++;
+                    }
+                    // fall through
+                case 'button':
+                    reachable = reachable || !el.hasAttribute('disabled');
+                    break;
+            }
+            if (!reachable) continue;
+            const style = window.getComputedStyle(el);
+            if (style.display !== 'none' && style.visibility !== 'hidden') focusable++;
+        }
+
+        // Skip-link presence
+        let skipLink = false;
+        for (let link of document.querySelectorAll('a[href^="#"]')) {
+            const text = link.textContent.toLowerCase();
+            if (text.includes('skip') || text.includes('דלג') || text.includes('main') || text.includes('תוכן')) {
+                skipLink = true;
+                break;
+            }
+        }
+
+        // Focus visibility: any :focus selector in the CSSOM, which also
+        // sees rules added through insertRule (CSS-in-JS) and ignores
+        // comments. Cross-origin sheets refuse cssRules access; only their
+        // hrefs are returned, to be fetched server-side
+        const styleHrefs = [];
+        const rulesOf = sheet => {
+            try {
+                return sheet.cssRules;
+            } catch (e) {
+                if (sheet.href) styleHrefs.push(sheet.href);
+                return [];
+            }
+        };
+        const hasFocusRule = rules => {
+            for (const rule of rules) {
+                if (rule.selectorText && rule.selectorText.includes(':focus')) return true;
+                // @media/@supports/nesting, and @import'ed sheets
+                if (rule.cssRules && hasFocusRule(rule.cssRules)) return true;
+                if (rule.styleSheet && hasFocusRule(rulesOf(rule.styleSheet))) return true;
+            }
+            return false;
+        };
+        let focusStyles = false;
+        for (const sheet of [...document.styleSheets, ...(document.adoptedStyleSheets || [])]) {
+            if (hasFocusRule(rulesOf(sheet))) {
+                focusStyles = true;
+                break;
+            }
+        }
+
+        return { interactive, focusable, skipLink, focusStyles, styleHrefs, formIssues };
+    }
+"""
 
-def scan_url_sync(url: str, standard: str = "IL_5568", locale: str = "he") -> dict:
+# The snippets above, installed once per context via add_init_script so each
+# new document has them compiled; per-scan evaluates only call them by name
+SCAN_INIT_JS = f"window.__a11yScan = {{ settled: {DOM_SETTLED_JS}, axe: {AXE_RUN_JS}, checks: {CHECKS_JS} }};"
+
+
+def scan_url_sync(
+    url: str,
+    standard: str = "IL_5568",
+    locale: str = "he",
+    context: Optional[BrowserContext] = None,
+    full_wcag: bool = True,
+) -> dict:
     """
     Main scanning function (runs in subprocess)
     Returns risk assessment focused response (v1.1)
-    """
-    scan_id = f"scan_{uuid.uuid4().hex[:12]}"
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    Pass a warm `context` to reuse it (worker mode); each scan then only
+    opens a page in it. Without one, a browser is launched for this scan.
+    Pass `full_wcag=False` to run only the AXE_RULES subset (quick preview).
+    """
+    if context is None:
+        with sync_playwright() as p:
+            browser = _launch(p)
+            try:
+                return scan_url_sync(url, standard, locale, _new_context(browser), full_wcag)
+            finally:
+                browser.close()
 
+    page = context.new_page()
+    try:
+        return _scan_page_sync(page, url, standard, locale, full_wcag)
+    finally:
+        # Cookies are cleared per scan by the worker; origin storage has no
+        # context-level reset, so drop it before the page goes away
         try:
-            # Use domcontentloaded instead of networkidle for faster, more reliable loading
-            page.goto(url, wait_until="domcontentloaded", timeout=45000)
-            # Wait a bit more for dynamic content
-            page.wait_for_timeout(2000)
-
-            # Run axe-core
-            page.add_script_tag(url="https://cdnjs.cloudflare.com/ajax/libs/axe-core/4.8.3/axe.min.js")
-            axe_results = page.evaluate("""
-                async () => {
-                    const results = await axe.run({
-                        runOnly: {
-                            type: 'tag',
-                            values: ['wcag2a', 'wcag2aa', 'wcag21a', 'wcag21aa', 'wcag22aa']
-                        }
-                    });
-                    return results;
-                }
-            """)
-
-            # Run Playwright checks
-            playwright_checks = []
-
-            # Check keyboard navigation (keyboard reachability)
-            interactive_count = page.evaluate("""
-                () => document.querySelectorAll('button, a, input, select, textarea, [tabindex]').length
-            """)
-            focusable_count = page.evaluate("""
-                () => {
-                    let count = 0;
-                    document.querySelectorAll(
-                        'button:not([disabled]), a[href], input:not([disabled]), ' +
-                        'select:not([disabled]), textarea:not([disabled]), [tabindex]:not([tabindex="-1"])'
-                    ).forEach(el => {
-                        const style = window.getComputedStyle(el);
-                        if (style.display !== 'none' && style.visibility !== 'hidden') count++;
-                    });
-                    return count;
-                }
-            """)
-            keyboard_issue = interactive_count > 0 and focusable_count < interactive_count * 0.9
-            if keyboard_issue:
-                playwright_checks.append({
-                    "check_key": "KEYBOARD_ACCESS",
-                    "severity": "critical",
-                    "nodes_count": interactive_count - focusable_count
-                })
-
-            # Check skip links (skip-link presence)
-            has_skip_link = page.evaluate("""
-                () => {
-                    for (let link of document.querySelectorAll('a[href^="#"]')) {
-                        const text = link.textContent.toLowerCase();
-                        if (text.includes('skip') || text.includes('דלג') || text.includes('main') || text.includes('תוכן'))
-                            return true;
-                    }
-                    return false;
-                }
-            """)
-            if not has_skip_link:
-                playwright_checks.append({
-                    "check_key": "SKIP_LINK",
-                    "severity": "moderate",
-                    "nodes_count": 1
-                })
-
-            # Check focus visibility
-            has_focus_styles = page.evaluate("""
-                () => {
-                    const styles = document.styleSheets;
-                    for (let sheet of styles) {
-                        try {
-                            for (let rule of sheet.cssRules || []) {
-                                if (rule.selectorText && rule.selectorText.includes(':focus')) {
-                                    return true;
-                                }
-                            }
-                        } catch (e) {}
-                    }
-                    return false;
-                }
-            """)
-            if not has_focus_styles:
-                playwright_checks.append({
-                    "check_key": "FOCUS_VISIBLE",
-                    "severity": "serious",
-                    "nodes_count": 1
-                })
-
-            # Check basic form error exposure
-            forms = page.evaluate("""
-                () => {
-                    const forms = document.querySelectorAll('form');
-                    let issues = 0;
-                    forms.forEach(form => {
-                        const inputs = form.querySelectorAll('input[required], select[required], textarea[required]');
-                        inputs.forEach(input => {
-                            const hasAriaDescribedby = input.hasAttribute('aria-describedby');
-                            const hasAriaErrormessage = input.hasAttribute('aria-errormessage');
-                            if (!hasAriaDescribedby && !hasAriaErrormessage) {
-                                issues++;
-                            }
-                        });
-                    });
-                    return issues;
-                }
-            """)
-            if forms > 0:
-                playwright_checks.append({
-                    "check_key": "FORM_ERRORS",
-                    "severity": "moderate",
-                    "nodes_count": forms
-                })
-
-            # Calculate score
-            score = 100
-            for v in axe_results.get("violations", []):
-                impact = v.get("impact", "moderate")
-                nodes = len(v.get("nodes", []))
-                weights = {"critical": 10, "serious": 5, "moderate": 2, "minor": 1}
-                score -= weights.get(impact, 2) * min(nodes, 5)
-            for c in playwright_checks:
-                weights = {"critical": 15, "serious": 10, "moderate": 5, "minor": 2}
-                score -= weights.get(c.get("severity", "moderate"), 5)
-            score = max(0, min(100, score))
-
-            # Count by severity
-            def count_severity(sev):
-                cnt = sum(len(v.get("nodes", [])) for v in axe_results.get("violations", []) if v.get("impact") == sev)
-                cnt += sum(c.get("nodes_count", 1) for c in playwright_checks if c.get("severity") == sev)
-                return cnt
-
-            critical = count_severity("critical")
-            serious = count_severity("serious")
-            moderate = count_severity("moderate")
-            minor = count_severity("minor")
-            total = critical + serious + moderate + minor
-
-            # Calculate risk level (v1.1 risk model)
-            # Risk Calculation:
-            # if critical_issues >= 5: CRITICAL
-            # elif critical_issues >= 3 or score < 40: HIGH
-            # elif score < 70: MEDIUM
-            # else: LOW
-            if critical >= 5:
-                risk_level = RISK_CRITICAL
-                risk_explanation_key = "RISK_CRITICAL"
-            elif critical >= 3 or score < 40:
-                risk_level = RISK_HIGH
-                risk_explanation_key = "RISK_HIGH"
-            elif score < 70:
-                risk_level = RISK_MEDIUM
-                risk_explanation_key = "RISK_MEDIUM"
-            else:
-                risk_level = RISK_LOW
-                risk_explanation_key = "RISK_LOW"
-
-            # Build checked_keys from what we actually checked
-            checked_keys = ["ALT_MISSING", "COLOR_CONTRAST", "ARIA", "FORM_LABELS"]
-            if keyboard_issue or focusable_count > 0:
-                checked_keys.append("KEYBOARD_ACCESS")
-            if not has_skip_link or has_skip_link:
-                # We always check for skip links
-                pass
-            checked_keys.append("FOCUS_VISIBLE")
-
-            # Return v1.1 API response format
-            return {
-                "scan_id": scan_id,
-                "url": url,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-
-                "score": score,
-
-                "risk": {
-                    "level": risk_level,
-                    "explanation_key": risk_explanation_key
-                },
-
-                "summary": {
-                    "total": total,
-                    "critical": critical,
-                    "serious": serious,
-                    "moderate": moderate,
-                    "minor": minor
-                },
-
-                "coverage": {
-                    "automated_estimate": 0.75,
-                    "checked_keys": checked_keys,
-                    "manual_required": True
-                },
-
-                "next_action": "DOWNLOAD_REPORT"
-            }
+            page.evaluate("() => localStorage.clear()")
+        except PlaywrightError:
+            pass
+        page.close()
+
+
+def _launch(p: Playwright) -> Browser:
+    return p.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+
+def _new_context(browser: Browser) -> BrowserContext:
+    context = browser.new_context()
+    context.route("**/*", _route_request)
+    context.add_init_script(AXE_INIT_JS)
+    context.add_init_script(SCAN_INIT_JS)
+    return context
+
+
+def _route_request(route: Route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
 
+
+def _scan_page_sync(page: Page, url: str, standard: str, locale: str, full_wcag: bool) -> dict:
+    scan_id = f"scan_{secrets.token_hex(6)}"  # 48 random bits, without building a UUID
+
+    # Use domcontentloaded instead of networkidle for faster, more reliable loading
+    page.goto(url, wait_until="domcontentloaded", timeout=45000)
+    # Wait for the load event and for dynamic content to settle, rather than
+    # a fixed sleep; a page that never settles is scanned as it stands
+    try:
+        page.wait_for_load_state("load", timeout=3000)
+        page.evaluate("() => window.__a11yScan.settled()")
+    except PlaywrightError:
+        pass
+
+    content_hash = hashlib.blake2b(page.content().encode("utf-8"), digest_size=16).digest()
+    cache_key = (url, standard, locale, full_wcag, content_hash)
+    cached = _RESULT_CACHE.get(cache_key)
+    if cached is not None:
+        return {**orjson.loads(cached), "scan_id": scan_id, "timestamp": datetime.utcnow()}
+
+    # Run axe-core (loaded by the context's init script)
+    axe_results = page.evaluate(
+        "runOnly => window.__a11yScan.axe(runOnly)", AXE_WCAG_TAGS if full_wcag else AXE_RULES
+    )
+
+    # Run Playwright checks (all DOM probes in one evaluate round-trip)
+    probes = page.evaluate("() => window.__a11yScan.checks()")
+    interactive_count = probes["interactive"]
+    focusable_count = probes["focusable"]
+    has_skip_link = probes["skipLink"]
+    has_focus_styles = probes["focusStyles"] or _sheets_have_focus_rule(probes["styleHrefs"])
+    forms = probes["formIssues"]
+
+    playwright_checks = []
+
+    # Check keyboard navigation (keyboard reachability)
+    keyboard_issue = interactive_count > 0 and focusable_count < interactive_count * 0.9
+    if keyboard_issue:
+        playwright_checks.append({
+            "check_key": "KEYBOARD_ACCESS",
+            "severity": "critical",
+            "nodes_count": interactive_count - focusable_count
+        })
+
+    # Check skip links (skip-link presence)
+    if not has_skip_link:
+        playwright_checks.append({
+            "check_key": "SKIP_LINK",
+            "severity": "moderate",
+            "nodes_count": 1
+        })
+
+    # Check focus visibility
+    if not has_focus_styles:
+        playwright_checks.append({
+            "check_key": "FOCUS_VISIBLE",
+            "severity": "serious",
+            "nodes_count": 1
+        })
+
+    # Check basic form error exposure
+    if forms > 0:
+        playwright_checks.append({
+            "check_key": "FORM_ERRORS",
+            "severity": "moderate",
+            "nodes_count": forms
+        })
+
+    # Calculate score and count by severity in one pass over each list
+    score = 100
+    counts = Counter()
+    for v in axe_results["violations"]:
+        nodes = v["count"]
+        score -= AXE_WEIGHTS.get(v.get("impact", "moderate"), 2) * min(nodes, 5)
+        counts[v.get("impact")] += nodes
+    for c in playwright_checks:
+        score -= CHECK_WEIGHTS.get(c.get("severity", "moderate"), 5)
+        counts[c.get("severity")] += c.get("nodes_count", 1)
+    score = max(0, min(100, score))
+
+    critical = counts["critical"]
+    serious = counts["serious"]
+    moderate = counts["moderate"]
+    minor = counts["minor"]
+    total = critical + serious + moderate + minor
+
+    # Calculate risk level (v1.1 risk model)
+    # Risk Calculation:
+    # if critical_issues >= 5: CRITICAL
+    # elif critical_issues >= 3 or score < 40: HIGH
+    # elif score < 70: MEDIUM
+    # else: LOW
+    if critical >= 5:
+        risk_level = RISK_CRITICAL
+        risk_explanation_key = "RISK_CRITICAL"
+    elif critical >= 3 or score < 40:
+        risk_level = RISK_HIGH
+        risk_explanation_key = "RISK_HIGH"
+    elif score < 70:
+        risk_level = RISK_MEDIUM
+        risk_explanation_key = "RISK_MEDIUM"
+    else:
+        risk_level = RISK_LOW
+        risk_explanation_key = "RISK_LOW"
+
+    # Build checked_keys from what we actually checked
+    checked_keys = ["ALT_MISSING", "COLOR_CONTRAST", "ARIA", "FORM_LABELS"]
+    if keyboard_issue or focusable_count > 0:
+        checked_keys.append("KEYBOARD_ACCESS")
+    if not has_skip_link or has_skip_link:
+        # We always check for skip links
+        pass
+    checked_keys.append("FOCUS_VISIBLE")
+
+    # Return v1.1 API response format
+    result = {
+        "scan_id": scan_id,
+        "url": url,
+        "timestamp": datetime.utcnow(),
+
+        "score": score,
+
+        "risk": {
+            "level": risk_level,
+            "explanation_key": risk_explanation_key
+        },
+
+        "summary": {
+            "total": total,
+            "critical": critical,
+            "serious": serious,
+            "moderate": moderate,
+            "minor": minor
+        },
+
+        "coverage": {
+            "automated_estimate": 0.75,
+            "mode": "full" if full_wcag else "subset",
+            "checked_keys": checked_keys,
+            "manual_required": True
+        },
+
+        "next_action": "DOWNLOAD_REPORT"
+    }
+    _RESULT_CACHE[cache_key] = orjson.dumps(result)
+    return result
+
+
+def _sheets_have_focus_rule(hrefs: list) -> bool:
+    """
+    Look for a :focus rule in cross-origin stylesheets, whose cssRules the
+    browser refuses to expose to CHECKS_JS, by fetching their text.
+    """
+    hrefs = [href for href in hrefs if href.startswith(("http://", "https://"))]
+    if not hrefs:
+        return False
+    pending = [_stylesheet_pool.submit(_stylesheet_has_focus_rule, href) for href in hrefs]
+    try:
+        for future in as_completed(pending, timeout=STYLESHEET_BUDGET_S):
+            if future.result():
+                return True
+    except FuturesTimeoutError:
+        pass
+    finally:
+        for future in pending:
+            future.cancel()
+    return False
+
+
+def _stylesheet_has_focus_rule(href: str) -> bool:
+    try:
+        response = _stylesheet_client.get(href)
+    except httpx.HTTPError:
+        return False
+    return response.is_success and ":focus" in _CSS_COMMENT_RE.sub("", response.text)
+
+
+def error_response(error: Exception) -> dict:
+    """Map a scan failure to the error payload (frontend will display Hebrew)"""
+    error_msg = str(error)
+    for needle, error_key in ERROR_KEYS:
+        if needle in error_msg:
+            break
+    else:
+        error_key = "PARTIAL_SCAN"
+    return {"error": error_msg, "error_key": error_key}
+
+
+def write_result(stdout: BinaryIO, payload: dict):
+    """Write one JSON line; naive datetimes are emitted as UTC with a Z suffix."""
+    stdout.write(orjson.dumps(payload, option=DUMPS_OPTIONS))
+    stdout.flush()
+
+
+def run_worker(stdin: BinaryIO = sys.stdin.buffer, stdout: BinaryIO = sys.stdout.buffer):
+    """
+    Long-lived worker: launch Chromium once, then scan one request per line.
+
+    Each input line is a JSON object {"url", "standard"?, "locale"?,
+    "full_wcag"? (default true)}; each output line is the scan result or error payload for
+    that request, in order. Stops at EOF.
+    """
+    with sync_playwright() as p:
+        browser = _launch(p)
+        context = None
+        scans = 0
+        try:
+            for line in stdin:
+                if not line.strip():
+                    continue
+                try:
+                    request = orjson.loads(line)
+                    if context is None or scans >= CONTEXT_MAX_SCANS:
+                        if context is not None:
+                            context.close()
+                        context = _new_context(browser)
+                        scans = 0
+                    else:
+                        context.clear_cookies()
+                        context.clear_permissions()
+                    scans += 1
+                    result = scan_url_sync(
+                        request["url"],
+                        request.get("standard", "IL_5568"),
+                        request.get("locale", "he"),
+                        context,
+                        request.get("full_wcag", True),
+                    )
+                except Exception as e:
+                    result = error_response(e)
+                    scans = CONTEXT_MAX_SCANS  # next scan starts on a fresh context
+                write_result(stdout, result)
         finally:
             browser.close()
 
 
 if __name__ == "__main__":
+    if sys.argv[1:] == ["--worker"]:
+        run_worker()
+        sys.exit(0)
+
     if len(sys.argv) < 2:
-        print(json.dumps({"error": "URL_REQUIRED", "error_key": "INVALID_URL"}))
+        write_result(sys.stdout.buffer, {"error": "URL_REQUIRED", "error_key": "INVALID_URL"})
         sys.exit(1)
 
     url = sys.argv[1]
@@ -239,17 +537,7 @@ if __name__ == "__main__":
 
     try:
         result = scan_url_sync(url, standard, locale)
-        print(json.dumps(result, ensure_ascii=False))
+        write_result(sys.stdout.buffer, result)
     except Exception as e:
-        error_msg = str(e)
-        # Map errors to keys (frontend will display Hebrew)
-        if "Timeout" in error_msg:
-            error_key = "TIMEOUT"
-        elif "net::ERR_BLOCKED" in error_msg or "403" in error_msg:
-            error_key = "BLOCKED"
-        elif "net::ERR" in error_msg:
-            error_key = "INVALID_URL"
-        else:
-            error_key = "PARTIAL_SCAN"
-        print(json.dumps({"error": error_msg, "error_key": error_key}, ensure_ascii=False))
+        write_result(sys.stdout.buffer, error_response(e))
         sys.exit(1)
@@ -0,0 +1,165 @@
+"""
+SMTP connection pool for report emails.
+Keeps a few authenticated aiosmtplib connections open between sends.
+"""
+
+import asyncio
+import logging
+from typing import Optional, Sequence
+
+import aiosmtplib
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPPool:
+    """
+    Reuses authenticated SMTP connections instead of paying TCP + STARTTLS +
+    AUTH on every email.
+
+    Connections are opened lazily (or up front via `fill()`), returned to the
+    pool after each send and kept alive with periodic NOOPs. Connections the
+    server has dropped are discarded and replaced transparently, and each
+    connection is retired after `max_messages` sends since many providers
+    throttle or reset long-lived sessions.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        size: int = 4,
+        keepalive_interval: float = 60.0,
+        max_messages: int = 100,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.size = size
+        self.keepalive_interval = keepalive_interval
+        self.max_messages = max_messages
+
+        self._idle: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self._keepalive_task: Optional[asyncio.Task] = None
+        # Messages sent per live connection
+        self._sent: dict[aiosmtplib.SMTP, int] = {}
+        # Whether the server advertises 8BITMIME (None until first connect)
+        self.supports_8bitmime: Optional[bool] = None
+
+    # ------------------------------------------------------------------ #
+    #  Public API
+    # ------------------------------------------------------------------ #
+
+    async def fill(self):
+        """Open connections until the pool is full. Failures are logged, not raised."""
+        while not self._idle.full():
+            try:
+                server = await self._connect()
+            except Exception as e:
+                logger.warning(f"SMTP pool prefill failed: {e}")
+                return
+            self._release(server)
+
+    def start(self):
+        """Start the background NOOP keepalive loop."""
+        if self._keepalive_task is None:
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def close(self):
+        """Stop the keepalive loop and quit all idle connections."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+
+    async def sendmail(
+        self,
+        sender: str,
+        recipients: Sequence[str],
+        message: bytes,
+        mail_options: Sequence[str] = (),
+    ):
+        """Send a pre-serialized message, reconnecting once if the pooled connection went stale."""
+        server = self._acquire_idle()
+        if server is not None:
+            try:
+                await server.sendmail(sender, recipients, message, mail_options=mail_options)
+            except aiosmtplib.SMTPServerDisconnected:
+                # Idle connection was closed by the server — retry on a fresh one
+                await self._discard(server)
+            except Exception:
+                await self._discard(server)
+                raise
+            else:
+                self._release_after_send(server)
+                return
+
+        server = await self._connect()
+        try:
+            await server.sendmail(sender, recipients, message, mail_options=mail_options)
+        except Exception:
+            await self._discard(server)
+            raise
+        self._release_after_send(server)
+
+    # ------------------------------------------------------------------ #
+    #  Helpers
+    # ------------------------------------------------------------------ #
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        server = aiosmtplib.SMTP(hostname=self.host, port=self.port, start_tls=False)
+        await server.connect()
+        try:
+            await server.starttls()
+            await server.login(self.user, self.password)
+        except Exception:
+            await self._discard(server)
+            raise
+        self._sent[server] = 0
+        self.supports_8bitmime = server.supports_extension("8bitmime")
+        return server
+
+    def _acquire_idle(self) -> Optional[aiosmtplib.SMTP]:
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    def _release(self, server: aiosmtplib.SMTP):
+        try:
+            self._idle.put_nowait(server)
+        except asyncio.QueueFull:
+            asyncio.create_task(self._discard(server))
+
+    def _release_after_send(self, server: aiosmtplib.SMTP):
+        self._sent[server] = self._sent.get(server, 0) + 1
+        if self._sent[server] >= self.max_messages:
+            asyncio.create_task(self._discard(server))
+        else:
+            self._release(server)
+
+    async def _discard(self, server: aiosmtplib.SMTP):
+        self._sent.pop(server, None)
+        try:
+            await server.quit()
+        except Exception:
+            server.close()
+
+    async def _keepalive_loop(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            for _ in range(self._idle.qsize()):
+                server = self._acquire_idle()
+                if server is None:
+                    break
+                try:
+                    await server.noop()
+                except Exception:
+                    logger.info("Dropping stale SMTP connection")
+                    await self._discard(server)
+                else:
+                    self._release(server)
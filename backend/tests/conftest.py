@@ -0,0 +1,88 @@
+"""
+Shared fixtures: a payment service on either session store, and a clock
+the stores' expiry logic can be moved forward on.
+"""
+
+import asyncio
+
+import pytest
+
+from app import payment
+from app.payment import PaymentService, _RedisSessionStore
+
+
+class FakeClock:
+    """Stands in for the `time` module inside app.payment."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class FakeRedis:
+    """The part of redis.asyncio the session store uses: GET, SET (EX/NX), DEL."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[bytes, float]] = {}
+
+    def _live(self, key: str):
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= payment.time.time():
+            self._data.pop(key, None)
+            return None
+        return entry[0]
+
+    async def get(self, key: str):
+        return self._live(key)
+
+    async def set(self, key: str, value, ex=None, nx=False):
+        if nx and self._live(key) is not None:
+            return None
+        if isinstance(value, str):
+            value = value.encode()
+        expires = payment.time.time() + ex if ex else float("inf")
+        self._data[key] = (value, expires)
+        return True
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def aclose(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(payment, "time", fake)
+    return fake
+
+
+@pytest.fixture(params=["memory", "redis"])
+def service(request, monkeypatch) -> PaymentService:
+    """Demo-mode PaymentService on the in-process store or a fake Redis."""
+    for var in ("MESHULAM_PAGE_CODE", "REDIS_URL", "PDF_TOKEN_SECRET"):
+        monkeypatch.delenv(var, raising=False)
+    svc = PaymentService()
+    if request.param == "redis":
+        store = _RedisSessionStore.__new__(_RedisSessionStore)
+        store._redis = FakeRedis()
+        svc._store = store
+    return svc
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def paid_session(svc: PaymentService, url: str = "https://example.com") -> dict:
+    """Create a session and complete it (demo mode auto-succeeds)."""
+    created = await svc.create_session(url=url, email="user@example.com", scan_id="scan_abc")
+    result = await svc.verify_session(created["session_id"])
+    return {**result, "session_id": created["session_id"]}
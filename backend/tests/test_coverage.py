@@ -0,0 +1,176 @@
+"""Which axe rule set ran: paid reports always come from the full WCAG sweep."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app import main, scanner, scanner_subprocess
+from app.pdf_generator import SUBSET_NOTICE_HTML, _build_standards_checklist_html
+
+from .conftest import paid_session, run
+
+PROBES = {
+    "interactiveCount": 0, "focusableCount": 0, "hasFocusIndicator": True,
+    "hasSkipLink": True, "formsTotal": 0, "formsWithErrors": 0, "hasStatementLink": True,
+}
+
+
+class FakePage:
+    """Records the runOnly argument axe was called with."""
+
+    def __init__(self):
+        self.axe_run_only = None
+
+    async def goto(self, url, **kwargs):
+        pass
+
+    async def wait_for_load_state(self, state, **kwargs):
+        pass
+
+    async def content(self):
+        return "<html><body>paid</body></html>"
+
+    async def evaluate(self, js, arg=None):
+        if "axe.run" in js:
+            self.axe_run_only = arg
+            return {"violations": []}
+        return PROBES
+
+
+class FakeContext:
+    def __init__(self, page):
+        self.page = page
+        self.init_scripts = []
+
+    async def route(self, pattern, handler):
+        pass
+
+    async def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    async def new_page(self):
+        return self.page
+
+
+class FakeBrowserPool:
+    def __init__(self):
+        self.context = FakeContext(FakePage())
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.context
+
+
+@pytest.fixture
+def paid_path(service, monkeypatch):
+    """The real verify → scan path, with the browser and renderer faked."""
+    pool = FakeBrowserPool()
+    rendered = []
+
+    async def render(results):
+        rendered.append(results)
+        return b"%PDF-1.7"
+
+    monkeypatch.setattr(main, "payment_service", service)
+    monkeypatch.setattr(scanner, "browser_pool", pool)
+    monkeypatch.setattr(main, "_render_pdf", render)
+    monkeypatch.setattr(main, "_get_smtp_pool", lambda: None)
+
+    async def send(**kwargs):
+        pass
+
+    monkeypatch.setattr(main, "_send_email", send)
+    main._SCAN_CACHE.clear()
+    scanner._REPORT_CACHE.clear()
+    yield pool, rendered
+    main._SCAN_CACHE.clear()
+    scanner._REPORT_CACHE.clear()
+
+
+def test_paid_report_comes_from_full_wcag_sweep(service, paid_path):
+    pool, rendered = paid_path
+
+    async def scenario():
+        sid = (await paid_session(service, url="https://paid.example"))["session_id"]
+        await main.verify_payment(sid)
+        while main._finalize_tasks:
+            await asyncio.gather(*list(main._finalize_tasks.values()))
+
+    run(scenario())
+
+    assert len(rendered) == 1
+    assert rendered[0]["coverage"]["mode"] == "full"
+    assert pool.context.page.axe_run_only == scanner.AXE_WCAG_TAGS
+    assert pool.context.init_scripts == [scanner.AXE_INIT_JS]
+
+
+# ---- Subprocess scanner ---- #
+
+class FakeSyncPage:
+    def __init__(self):
+        self.axe_run_only = None
+
+    def goto(self, url, **kwargs):
+        pass
+
+    def wait_for_load_state(self, state, **kwargs):
+        pass
+
+    def content(self):
+        return "<html><body>preview</body></html>"
+
+    def evaluate(self, js, arg=None):
+        if ".axe(" in js:
+            self.axe_run_only = arg
+            return {"violations": []}
+        if ".checks(" in js:
+            return {"interactive": 0, "focusable": 0, "skipLink": True,
+                    "focusStyles": True, "styleHrefs": [], "formIssues": 0}
+        return None
+
+    def close(self):
+        pass
+
+
+class FakeSyncContext:
+    def __init__(self):
+        self.page = FakeSyncPage()
+
+    def new_page(self):
+        return self.page
+
+
+@pytest.fixture
+def sync_context():
+    scanner_subprocess._RESULT_CACHE.clear()
+    yield FakeSyncContext()
+    scanner_subprocess._RESULT_CACHE.clear()
+
+
+def test_subprocess_scan_defaults_to_full_sweep(sync_context):
+    result = scanner_subprocess.scan_url_sync("https://a.example", context=sync_context)
+    assert result["coverage"]["mode"] == "full"
+    assert sync_context.page.axe_run_only == scanner_subprocess.AXE_WCAG_TAGS
+
+
+def test_subprocess_subset_is_opt_in_and_labelled(sync_context):
+    result = scanner_subprocess.scan_url_sync(
+        "https://a.example", context=sync_context, full_wcag=False
+    )
+    assert result["coverage"]["mode"] == "subset"
+    assert sync_context.page.axe_run_only == scanner_subprocess.AXE_RULES
+
+
+# ---- PDF checklist ---- #
+
+def test_subset_report_does_not_claim_coverage():
+    subset = _build_standards_checklist_html(
+        {"coverage": {"mode": "subset", "automated_estimate": 0.75, "checked_keys": ["ARIA"]}}
+    )
+    full = _build_standards_checklist_html(
+        {"coverage": {"mode": "full", "automated_estimate": 0.77, "checked_keys": ["ARIA"]}}
+    )
+
+    assert SUBSET_NOTICE_HTML in subset and "75%" not in subset
+    assert SUBSET_NOTICE_HTML not in full and "77%" in full
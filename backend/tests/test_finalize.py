@@ -0,0 +1,167 @@
+"""Post-payment finalize: verify polls, the shared claim, and downloads waiting on it."""
+
+import asyncio
+
+import pytest
+
+from app import main
+from app.payment import FINALIZE_DONE, FINALIZE_RUNNING
+
+from .conftest import paid_session, run
+
+PDF = b"%PDF-1.7 paid report"
+
+
+class FakeBackend:
+    """Counts scans, renders and emails; each can be made to fail once."""
+
+    def __init__(self):
+        self.scans = 0
+        self.renders = 0
+        self.emails = 0
+        self.fail_render = False
+        self.fail_email = False
+
+    async def scan(self, url, standard="IL_5568", locale="he"):
+        self.scans += 1
+        await asyncio.sleep(0.01)
+        return {"scan_id": "scan_abc", "timestamp": "2026-01-01T00:00:00Z", "url": url}
+
+    async def render(self, results):
+        self.renders += 1
+        if self.fail_render:
+            self.fail_render = False
+            raise RuntimeError("renderer crashed")
+        return PDF
+
+    async def send(self, **kwargs):
+        self.emails += 1
+        if self.fail_email:
+            self.fail_email = False
+            raise ConnectionError("SMTP relay unavailable")
+
+
+@pytest.fixture
+def backend(service, monkeypatch) -> FakeBackend:
+    fake = FakeBackend()
+    monkeypatch.setattr(main, "payment_service", service)
+    monkeypatch.setattr(main, "_cached_scan", fake.scan)
+    monkeypatch.setattr(main, "_render_pdf", fake.render)
+    monkeypatch.setattr(main, "_send_email", fake.send)
+    monkeypatch.setattr(main, "_get_smtp_pool", lambda: None)
+    monkeypatch.setattr(main, "_FINALIZE_POLL", 0.01)
+    return fake
+
+
+async def _drain_finalize_tasks():
+    while main._finalize_tasks:
+        await asyncio.gather(*list(main._finalize_tasks.values()))
+
+
+async def _poll(session_id: str, times: int = 1):
+    await asyncio.gather(*(main.verify_payment(session_id) for _ in range(times)))
+    await _drain_finalize_tasks()
+
+
+def test_concurrent_verifies_finalize_once(service, backend):
+    async def scenario():
+        sid = (await paid_session(service))["session_id"]
+
+        await _poll(sid, times=5)
+        assert (backend.scans, backend.renders, backend.emails) == (1, 1, 1)
+        assert await service.finalize_state(sid) == FINALIZE_DONE
+        assert await service.get_cached_pdf(sid) == PDF
+
+        # Later polls (any worker) see the shared done marker
+        await _poll(sid, times=3)
+        assert (backend.scans, backend.emails) == (1, 1)
+
+    run(scenario())
+
+
+def test_failed_render_is_retried_on_next_verify(service, backend):
+    backend.fail_render = True
+
+    async def scenario():
+        sid = (await paid_session(service))["session_id"]
+
+        await _poll(sid)
+        assert backend.emails == 0
+        assert await service.finalize_state(sid) is None
+        assert await service.get_scan(sid) is None
+
+        await _poll(sid)
+        assert (backend.renders, backend.emails) == (2, 1)
+        assert await service.finalize_state(sid) == FINALIZE_DONE
+
+    run(scenario())
+
+
+def test_failed_email_is_retried_on_next_verify(service, backend):
+    backend.fail_email = True
+
+    async def scenario():
+        sid = (await paid_session(service))["session_id"]
+
+        await _poll(sid)
+        assert backend.emails == 1
+        assert await service.finalize_state(sid) is None
+        # The report is already downloadable while the email is retried
+        assert await service.get_cached_pdf(sid) == PDF
+
+        await _poll(sid)
+        assert backend.emails == 2
+        assert await service.finalize_state(sid) == FINALIZE_DONE
+
+    run(scenario())
+
+
+def test_unconfigured_smtp_still_finishes(service, backend, monkeypatch):
+    def no_smtp():
+        raise RuntimeError("SMTP not configured.")
+
+    monkeypatch.setattr(main, "_get_smtp_pool", no_smtp)
+
+    async def scenario():
+        sid = (await paid_session(service))["session_id"]
+        await _poll(sid)
+        await _poll(sid)
+        assert (backend.renders, backend.emails) == (1, 0)
+        assert await service.finalize_state(sid) == FINALIZE_DONE
+
+    run(scenario())
+
+
+def test_download_waits_for_finalize_running_elsewhere(service, backend):
+    async def scenario():
+        paid = await paid_session(service)
+        sid = paid["session_id"]
+        # Another worker holds the claim; nothing runs in this process
+        assert await service.claim_finalize(sid)
+        assert await service.finalize_state(sid) == FINALIZE_RUNNING
+
+        download = asyncio.ensure_future(main.download_pdf_by_token(paid["pdf_token"]))
+        await asyncio.sleep(0.05)
+        assert not download.done()
+
+        await service.store_pdf(sid, PDF)
+        response = await asyncio.wait_for(download, timeout=1)
+        body = b"".join([bytes(chunk) async for chunk in response.body_iterator])
+
+        assert body == PDF
+        assert (backend.scans, backend.renders) == (0, 0)
+
+    run(scenario())
+
+
+def test_download_renders_when_no_finalize_is_running(service, backend):
+    async def scenario():
+        paid = await paid_session(service)
+        response = await main.download_pdf_by_token(paid["pdf_token"])
+        body = b"".join([bytes(chunk) async for chunk in response.body_iterator])
+
+        assert body == PDF
+        assert (backend.scans, backend.renders) == (1, 1)
+        assert await service.get_scan(paid["session_id"]) is not None
+
+    run(scenario())
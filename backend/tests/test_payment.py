@@ -0,0 +1,170 @@
+"""PaymentService: download tokens, download counting, session expiry, finalize claims."""
+
+from app.payment import (
+    FINALIZE_CLAIM_TTL,
+    FINALIZE_DONE,
+    PDF_CACHED_DOWNLOADS,
+    SESSION_TTL,
+    TOKEN_TTL,
+    PaymentService,
+    _MemorySessionStore,
+)
+
+from .conftest import paid_session, run
+
+
+# ---- Download tokens ---- #
+
+def test_token_round_trip(service, clock):
+    token = service._sign_token("pay_abc", int(clock.now) + 60)
+    assert service._verify_token(token) == "pay_abc"
+
+
+def test_token_rejects_tampering(service, clock):
+    token = service._sign_token("pay_abc", int(clock.now) + 60)
+    session_id, expires, sig = token.split(".")
+
+    assert service._verify_token(f"pay_xyz.{expires}.{sig}") is None
+    assert service._verify_token(f"{session_id}.{int(expires) + 3600}.{sig}") is None
+    assert service._verify_token(f"{session_id}.{expires}.{sig[:-2]}AA") is None
+
+
+def test_token_signed_with_another_key_is_rejected(service, clock, monkeypatch):
+    monkeypatch.setenv("PDF_TOKEN_SECRET", "some-other-secret")
+    other = PaymentService()
+    token = other._sign_token("pay_abc", int(clock.now) + 60)
+    assert service._verify_token(token) is None
+
+
+def test_token_expires(service, clock):
+    token = service._sign_token("pay_abc", int(clock.now) + TOKEN_TTL)
+
+    clock.advance(TOKEN_TTL)
+    assert service._verify_token(token) == "pay_abc"
+    clock.advance(1)
+    assert service._verify_token(token) is None
+
+
+def test_malformed_tokens_are_rejected(service):
+    for token in ("", "garbage", "a.b", "pay_abc.soon.sig", "a.b.c.d"):
+        assert service._verify_token(token) is None
+
+
+def test_non_ascii_token_is_rejected(service, clock):
+    expires = int(clock.now) + 60
+    assert service._verify_token(f"pay_x.{expires}.\u00e9") is None
+    assert service._verify_token(f"pay_\u05d0.{expires}.\u05d1\u05d2") is None
+    assert run(service.get_session_by_token(f"pay_x.{expires}.\u00e9")) is None
+
+
+def test_session_by_token_requires_completed_unexpired_session(service, clock):
+    async def scenario():
+        paid = await paid_session(service)
+        session = await service.get_session_by_token(paid["pdf_token"])
+        assert session["session_id"] == paid["session_id"]
+
+        # A valid signature for a session that was never paid
+        pending = await service.create_session(
+            url="https://example.com", email="user@example.com", scan_id=""
+        )
+        forged = service._sign_token(pending["session_id"], int(clock.now) + 60)
+        assert await service.get_session_by_token(forged) is None
+
+        clock.advance(TOKEN_TTL + 1)
+        assert await service.get_session_by_token(paid["pdf_token"]) is None
+
+    run(scenario())
+
+
+# ---- Download counting ---- #
+
+def test_record_download_releases_pdf_after_limit(service):
+    async def scenario():
+        sid = (await paid_session(service))["session_id"]
+        await service.store_pdf(sid, b"%PDF-1.7 report")
+
+        for _ in range(PDF_CACHED_DOWNLOADS - 1):
+            await service.record_download(sid)
+            assert await service.get_cached_pdf(sid) == b"%PDF-1.7 report"
+
+        await service.record_download(sid)
+        assert await service.get_cached_pdf(sid) is None
+        assert (await service.get_session(sid))["download_count"] == PDF_CACHED_DOWNLOADS
+
+    run(scenario())
+
+
+def test_record_download_ignores_unknown_session(service):
+    run(service.record_download("pay_missing"))
+
+
+# ---- Session expiry (in-process store) ---- #
+
+def test_memory_store_cleanup_drops_expired_sessions_only(clock, monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    monkeypatch.delenv("MESHULAM_PAGE_CODE", raising=False)
+    service = PaymentService()
+    store = service._store
+    assert isinstance(store, _MemorySessionStore)
+
+    async def scenario():
+        old = (await paid_session(service))["session_id"]
+        await service.store_pdf(old, b"old")
+        await service.store_scan(old, {"score": 1})
+        assert await service.claim_finalize(old)
+
+        clock.advance(SESSION_TTL / 2)
+        new = (await paid_session(service))["session_id"]
+
+        clock.advance(SESSION_TTL / 2)
+        store.cleanup()
+
+        assert await service.get_session(old) is None
+        assert await service.get_cached_pdf(old) is None
+        assert await service.get_scan(old) is None
+        assert old not in store._finalize
+        assert await service.get_session(new) is not None
+        assert store._expiry == [(store._sessions[new]["expires_at"], new)]
+
+    run(scenario())
+
+
+# ---- Finalize claims ---- #
+
+def test_finalize_claim_is_exclusive_until_released(service):
+    async def scenario():
+        sid = (await paid_session(service))["session_id"]
+        assert await service.claim_finalize(sid)
+        assert not await service.claim_finalize(sid)
+
+        await service.release_finalize(sid)
+        assert await service.finalize_state(sid) is None
+        assert await service.claim_finalize(sid)
+
+    run(scenario())
+
+
+def test_finished_finalize_is_never_claimed_again(service, clock):
+    async def scenario():
+        sid = (await paid_session(service))["session_id"]
+        assert await service.claim_finalize(sid)
+        await service.finish_finalize(sid)
+
+        clock.advance(FINALIZE_CLAIM_TTL + 1)
+        assert await service.finalize_state(sid) == FINALIZE_DONE
+        assert not await service.claim_finalize(sid)
+
+    run(scenario())
+
+
+def test_abandoned_finalize_claim_expires(service, clock):
+    async def scenario():
+        sid = (await paid_session(service))["session_id"]
+        assert await service.claim_finalize(sid)
+
+        clock.advance(FINALIZE_CLAIM_TTL - 1)
+        assert not await service.claim_finalize(sid)
+        clock.advance(1)
+        assert await service.claim_finalize(sid)
+
+    run(scenario())